@@ -0,0 +1,158 @@
+"""
+Benchmark the vectorized diff functions against the former
+row by row implementation
+
+Run from the repository root: ``python -m benchmarks.bench_diff``
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+from numpy import nan
+import pandas as pd
+
+from dataspace.calculations import _diffn, _diffp, _diffm, _diffs, _diffsp
+
+SIZES = [1000, 10000, 50000]
+
+
+# **************************
+#   loop implementations
+# **************************
+
+
+def _loop_diffn(df, diffcol, name="Diff", doround=True, percent=False):
+    vals = []
+    i = 0
+    for _, row in df.iterrows():
+        current = row[diffcol]
+        try:
+            nextv = df[diffcol].iloc[i + 1]
+        except Exception:
+            vals.append(nan)
+            continue
+        if percent is False:
+            val = current - nextv
+        else:
+            val = ((current - nextv) * 100) / nextv
+        if doround is True:
+            val = round(val, 2)
+        vals.append(val)
+        i += 1
+    df[name] = vals
+    return df
+
+
+def _loop_diffp(df, diffcol, name="Diff", doround=True, percent=False):
+    previous = 0
+    i = 0
+    vals = [df[diffcol].iloc[0]]
+    for _, row in df.iterrows():
+        if i == 0:
+            vals = [0]
+        else:
+            if percent is False:
+                val = row[diffcol] - previous
+            else:
+                val = ((row[diffcol] - previous) * 100) / previous
+            if doround is True:
+                val = round(val, 2)
+            vals.append(val)
+        previous = row[diffcol]
+        i = 1
+    df[name] = vals
+    return df
+
+
+def _loop_diffm(df, diffcol, name="Diff", default=nan, doround=True, percent=False):
+    mean = df[diffcol].mean()
+    vals = []
+    for _, row in df.iterrows():
+        num = row[diffcol]
+        if num > 0:
+            if percent is True:
+                diff = num - mean
+            else:
+                diff = ((num - mean) * 100) / mean
+            if doround is True:
+                diff = round(diff, 2)
+            vals.append(diff)
+        else:
+            vals.append(default)
+    df[name] = vals
+    return df
+
+
+def _loop_diffs(df, col, serie, name="Diff"):
+    d = []
+    for i, row in df.iterrows():
+        d.append(row[col] - serie[i])
+    df[name] = d
+    return df
+
+
+def _loop_diffsp(df, col, serie, name="Diff"):
+    d = []
+    for i, row in df.iterrows():
+        d.append((row[col] * 100) / serie[i])
+    df[name] = d
+    return df
+
+
+# **************************
+#          runner
+# **************************
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "value": rng.uniform(-10, 100, rows).round(3),
+            "other": rng.uniform(1, 100, rows).round(3),
+        }
+    )
+
+
+def _timeit(func, df, *args, **kwargs):
+    df = df.copy()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), np.errstate(all="ignore"):
+        df = func(df, *args, **kwargs)
+    return time.perf_counter() - start, df["Diff"]
+
+
+def run():
+    cases = [
+        ("diffn", _loop_diffn, _diffn, ("value",), {}),
+        ("diffnp", _loop_diffn, _diffn, ("value",), {"percent": True}),
+        ("diffp", _loop_diffp, _diffp, ("value",), {}),
+        ("diffpp", _loop_diffp, _diffp, ("value",), {"percent": True}),
+        ("diffm", _loop_diffm, _diffm, ("value",), {}),
+        ("diffmp", _loop_diffm, _diffm, ("value",), {"percent": True}),
+    ]
+    print(
+        f"{'function':<10}{'rows':>10}{'loop (s)':>12}{'vector (s)':>12}{'speedup':>10}"
+    )
+    for rows in SIZES:
+        df = _frame(rows)
+        serie = list(df["other"])
+        row_cases = cases + [
+            ("diffs", _loop_diffs, _diffs, ("value", serie), {}),
+            ("diffsp", _loop_diffsp, _diffsp, ("value", serie), {}),
+        ]
+        for label, loop, vector, args, kwargs in row_cases:
+            tloop, expected = _timeit(loop, df, *args, **kwargs)
+            tvec, result = _timeit(vector, df, *args, **kwargs)
+            np.testing.assert_allclose(
+                result.to_numpy(dtype=float), expected.to_numpy(dtype=float)
+            )
+            print(
+                f"{label:<10}{rows:>10}{tloop:>12.4f}{tvec:>12.4f}{tloop / tvec:>9.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,49 @@
+"""
+Measure the time and memory used by ``import dataspace`` and check
+that the charts libraries are not loaded at import time
+
+Run from the repository root: ``python -m benchmarks.bench_import``
+"""
+
+import json
+import subprocess
+import sys
+
+RUNS = 5
+
+# the charts libraries must only be imported when a chart engine is used
+HEAVY_MODULES = ["altair", "holoviews", "bokeh", "IPython"]
+
+SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import dataspace
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "time": elapsed,
+    "maxrss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def _measure(script: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run():
+    results = [_measure(SCRIPT % HEAVY_MODULES) for _ in range(RUNS)]
+    best = min(r["time"] for r in results)
+    print(f"import dataspace: {best:.3f}s (best of {RUNS})")
+    print(f"max rss: {results[0]['maxrss'] / 1024:.0f} MB")
+    loaded = results[0]["loaded"]
+    if len(loaded) > 0:
+        print("Heavy modules loaded at import time:", ", ".join(loaded))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,405 @@
+"""
+Time every public DataSpace operation, the data loading and export and
+the charts construction on synthetic frames, and compare the timings
+with a stored baseline
+
+Run from the repository root::
+
+    python -m benchmarks.bench_suite --compare
+    python -m benchmarks.bench_suite --sizes 10k,1M --save mybranch
+
+Use ``--sizes 10k,1M,10M`` for the large frames and ``--only diff`` to
+run the cases whose name contains a string. The baselines are stored as
+json files in ``benchmarks/baselines``: ``--compare`` without a name
+reads the committed ``main`` baseline, measured on the default sizes.
+The timings depend on the machine: save a baseline of the main branch
+on the same machine before comparing a change
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+import dataspace
+from dataspace import DataSpace, set_verbosity
+
+SIZES = {"10k": 10_000, "1M": 1_000_000, "10M": 10_000_000}
+
+BASELINES_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# the baseline committed with the suite, compared by default
+DEFAULT_BASELINE = "main"
+
+# a case is slower than its baseline above this ratio
+THRESHOLD = 1.2
+
+# the cases faster than this are too noisy to be compared
+MIN_TIME = 0.001
+
+# the methods that only set an option or display something
+NOT_TIMED = [
+    "altair",
+    "axis",
+    "bokeh",
+    "cache_",
+    "cache_clear",
+    "cow",
+    "inplace",
+    "lazy",
+    "plan_",
+    "trace",
+    "trace_",
+    "export_trace",
+]
+
+
+# **************************
+#          frames
+# **************************
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    """
+    Synthetic frame: dates, padded strings with empty values, categories,
+    floats with missing values and integers with zeros
+    """
+    rng = np.random.default_rng(0)
+    names = np.array([" name " + str(i) + " " for i in range(1000)] + [""])
+    dates = pd.date_range("2020-01-01", periods=rows, freq="min")
+    # format a limited set of dates and repeat them: strftime is slow
+    day_strings = pd.date_range("2020-01-01", periods=1000, freq="D").strftime(
+        "%Y-%m-%d"
+    )
+    value = rng.normal(100, 20, rows)
+    value[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "day": day_strings.to_numpy()[rng.integers(0, 1000, rows)],
+            "name": names[rng.integers(0, len(names), rows)],
+            "category": rng.integers(0, 50, rows),
+            "value": value,
+            "number": rng.integers(0, 10, rows),
+        }
+    )
+
+
+def _group_mean(df: pd.DataFrame) -> pd.DataFrame:
+    df["mean"] = df["value"].mean()
+    return df
+
+
+def _lazy_plan(ds: DataSpace) -> Callable:
+    ds.lazy()
+    ds.fill_nan(0, "value")
+    ds.strip("name")
+    ds.exclude("name", "")
+    ds.keep("date", "name", "value")
+    return ds.collect
+
+
+def _appends(ds: DataSpace) -> Callable:
+    rows = ds.df.head(1000).values.tolist()
+
+    def run():
+        for row in rows:
+            ds.append(row)
+        ds.flush()
+
+    return run
+
+
+def _with_dateindex(ds: DataSpace) -> DataSpace:
+    ds.dateindex("date")
+    return ds
+
+
+def _chart(engine: str, method: str, **kwargs) -> Callable:
+    def prepare(ds: DataSpace) -> Callable:
+        getattr(ds, engine)()
+        ds.axis("date", "value")
+        return lambda: getattr(ds, method)(**kwargs)
+
+    return prepare
+
+
+# **************************
+#           cases
+# **************************
+
+# each case prepares a fresh DataSpace and returns the timed callable
+CASES: Dict[str, Callable[[DataSpace], Callable]] = {
+    # info
+    "show": lambda ds: lambda: ds.show(),
+    "cols_": lambda ds: ds.cols_,
+    "memory_": lambda ds: ds.memory_,
+    # count
+    "count_empty_": lambda ds: lambda: ds.count_empty_("name"),
+    "count_null_": lambda ds: lambda: ds.count_null_("value"),
+    "count_unique_": lambda ds: lambda: ds.count_unique_("name"),
+    "count_zero_": lambda ds: lambda: ds.count_zero_("number"),
+    "profile_": lambda ds: ds.profile_,
+    "unique_": lambda ds: lambda: ds.unique_("name"),
+    "wunique_": lambda ds: lambda: ds.wunique_("name"),
+    # clean
+    "to_date": lambda ds: lambda: ds.to_date("day"),
+    "to_float": lambda ds: lambda: ds.to_float("number"),
+    "to_int": lambda ds: lambda: ds.to_int("category"),
+    "to_type": lambda ds: lambda: ds.to_type(str, "category"),
+    "optimize_": lambda ds: ds.optimize_,
+    "drop_nan": lambda ds: lambda: ds.drop_nan("value"),
+    "fill_nan": lambda ds: lambda: ds.fill_nan(0, "value"),
+    "fill_nulls": lambda ds: lambda: ds.fill_nulls(np.nan, "name"),
+    "fdate": lambda ds: lambda: ds.fdate("date", precision="H"),
+    "timestamps": lambda ds: lambda: ds.timestamps("date"),
+    "index": lambda ds: lambda: ds.index("category"),
+    "dateindex": lambda ds: lambda: ds.dateindex("date"),
+    "indexcol": lambda ds: lambda: ds.indexcol("position"),
+    "strip": lambda ds: lambda: ds.strip("name"),
+    "strip_cols": lambda ds: ds.strip_cols,
+    "roundvals": lambda ds: lambda: ds.roundvals("value", 1),
+    "replace": lambda ds: lambda: ds.replace("name", "", "unknown"),
+    "clean_": lambda ds: lambda: ds.clean_(
+        {"name": [("strip",)], "value": [("roundvals", 1), ("fill_nan", 0)]}
+    ),
+    # transform
+    "add": lambda ds: lambda: ds.add("new", 0),
+    "append": _appends,
+    "flush": lambda ds: ds.flush,
+    "apply": lambda ds: lambda: ds.apply(lambda serie: serie * 2, "value"),
+    "copycol": lambda ds: lambda: ds.copycol("value", "copy"),
+    "drop": lambda ds: lambda: ds.drop("day"),
+    "dropr": lambda ds: lambda: ds.dropr(*range(10)),
+    "exclude": lambda ds: lambda: ds.exclude("name", ""),
+    "keep": lambda ds: lambda: ds.keep("date", "value"),
+    "limit": lambda ds: lambda: ds.limit(100),
+    "rename": lambda ds: lambda: ds.rename("value", "renamed"),
+    "reverse": lambda ds: ds.reverse,
+    "sort": lambda ds: lambda: ds.sort("value"),
+    "split_": lambda ds: lambda: ds.split_("category"),
+    "map_groups": lambda ds: lambda: ds.map_groups("category", _group_mean),
+    "rsum": lambda ds: lambda: _with_dateindex(ds).rsum("1D", "Sum"),
+    "rmean": lambda ds: lambda: _with_dateindex(ds).rmean("1D", "Mean"),
+    "resampler_": lambda ds: lambda: ds.resampler_("1D", "Sum", "date"),
+    # lazy
+    "collect": _lazy_plan,
+    # calculations
+    "diffn": lambda ds: lambda: ds.diffn("value"),
+    "diffnp": lambda ds: lambda: ds.diffnp("value"),
+    "diffp": lambda ds: lambda: ds.diffp("value"),
+    "diffpp": lambda ds: lambda: ds.diffpp("value"),
+    "diffm": lambda ds: lambda: ds.diffm("value"),
+    "diffmp": lambda ds: lambda: ds.diffmp("value"),
+    "diffs": lambda ds: lambda: ds.diffs("value", ds.df["number"]),
+    "diffsp": lambda ds: lambda: ds.diffsp("value", ds.df["number"]),
+    "rolling_": lambda ds: lambda: ds.rolling_("value", 100),
+    "ewm_": lambda ds: lambda: ds.ewm_("value", 20),
+    "zscore_": lambda ds: lambda: ds.zscore_("value", "1h", on="date"),
+    "lreg_": lambda ds: lambda: ds.lreg_("number", "value", by="category"),
+    "lreg": lambda ds: lambda: ds.lreg("number", "value", by="category"),
+    # charts
+    "line_ bokeh": _chart("bokeh", "line_"),
+    "point_ bokeh": _chart("bokeh", "point_"),
+    "area_ bokeh": _chart("bokeh", "area_"),
+    "bar_ bokeh": _chart("bokeh", "bar_", downsample=None),
+    "hline_ bokeh": _chart("bokeh", "hline_"),
+    "lreg_chart_ bokeh": _chart("bokeh", "lreg_chart_"),
+    "line_ altair": _chart("altair", "line_"),
+    "point_ altair": _chart("altair", "point_"),
+    "area_ altair": _chart("altair", "area_"),
+    "bar_ altair": _chart("altair", "bar_", downsample=None),
+    "bar_num_ altair": _chart("altair", "bar_num_", downsample=None),
+    "hline_ altair": _chart("altair", "hline_"),
+    "lreg_chart_ altair": _chart("altair", "lreg_chart_"),
+}
+
+
+def _io_cases(tmpdir: str) -> Dict[str, Callable[[DataSpace], Callable]]:
+    """
+    Load and export cases, writing to a temporary directory
+    """
+    path = os.path.join(tmpdir, "data")
+    db = sqlite3.connect(path + ".sqlite")
+    cases = {
+        "export_csv": lambda ds: lambda: ds.export_csv(path + ".csv"),
+        "from_csv": lambda ds: lambda: dataspace.from_csv(path + ".csv"),
+        "export_sql": lambda ds: lambda: ds.export_sql("data", db, if_exists="replace"),
+        "from_sql": lambda ds: lambda: dataspace.from_sql("SELECT * FROM data", db),
+    }
+    try:
+        import pyarrow  # noqa: F401
+
+        cases["export_parquet"] = lambda ds: lambda: ds.export_parquet(
+            path + ".parquet"
+        )
+        cases["from_parquet"] = lambda ds: lambda: dataspace.from_parquet(
+            path + ".parquet"
+        )
+        cases["export_feather"] = lambda ds: lambda: ds.export_feather(
+            path + ".feather"
+        )
+        cases["from_arrow"] = lambda ds: lambda: dataspace.from_arrow(path + ".feather")
+    except ImportError:
+        print("pyarrow is not installed: skipping the parquet and arrow cases")
+    return cases
+
+
+def _uncovered(cases: Dict[str, Callable]) -> List[str]:
+    """
+    Get the public DataSpace methods without a benchmark case
+    """
+    timed = set(name.split(" ")[0] for name in cases)
+    return [
+        name
+        for name in dir(DataSpace)
+        if not name.startswith("_")
+        and callable(getattr(DataSpace, name))
+        and name not in timed
+        and name not in NOT_TIMED
+    ]
+
+
+# **************************
+#          runner
+# **************************
+
+
+def _time(prepare: Callable, df: pd.DataFrame, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        with np.errstate(all="ignore"):
+            run = prepare(DataSpace(df))
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run_cases(sizes: List[str], only: str = None, repeat: int = 3) -> Dict[str, float]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cases = dict(CASES)
+        # the export cases write the files read by the load cases
+        cases.update(_io_cases(tmpdir))
+        missing = _uncovered(cases)
+        if len(missing) > 0:
+            print("Public methods without a benchmark case:", ", ".join(missing))
+        for size in sizes:
+            df = _frame(SIZES[size])
+            # the large frames are timed once
+            runs = 1 if SIZES[size] >= 10_000_000 else repeat
+            for name, prepare in cases.items():
+                if only is not None and only not in name:
+                    continue
+                key = name + " @ " + size
+                try:
+                    results[key] = _time(prepare, df, runs)
+                except Exception as e:
+                    print(f"{key:<32}failed: {e}")
+                    continue
+                print(f"{key:<32}{results[key]:>12.4f}s")
+    return results
+
+
+def _baseline_path(name: str) -> str:
+    if name.endswith(".json"):
+        return name
+    return os.path.join(BASELINES_DIR, name + ".json")
+
+
+def save(results: Dict[str, float], name: str) -> None:
+    path = _baseline_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    print("Baseline saved to", path)
+
+
+def compare(results: Dict[str, float], name: str, threshold: float) -> bool:
+    """
+    Print a comparison report and return False if a case is slower
+    than its baseline
+    """
+    with open(_baseline_path(name)) as f:
+        baseline = json.load(f)
+    print()
+    meta = baseline["meta"]
+    print(
+        f"Baseline of {meta['date']}: python {meta['python']}, "
+        f"pandas {meta['pandas']}, numpy {meta['numpy']}"
+    )
+    print(f"{'case':<32}{'baseline (s)':>14}{'current (s)':>14}{'ratio':>8}")
+    ok = True
+    for key, current in results.items():
+        if key not in baseline["results"]:
+            print(f"{key:<32}{'-':>14}{current:>14.4f}{'new':>8}")
+            continue
+        before = baseline["results"][key]
+        ratio = current / before if before > 0 else float("inf")
+        flag = ""
+        if max(before, current) >= MIN_TIME:
+            if ratio > threshold:
+                flag = "  slower"
+                ok = False
+            elif ratio < 1 / threshold:
+                flag = "  faster"
+        print(f"{key:<32}{before:>14.4f}{current:>14.4f}{ratio:>8.2f}{flag}")
+    return ok
+
+
+def run():
+    parser = argparse.ArgumentParser(description="DataSpace benchmark suite")
+    parser.add_argument(
+        "--sizes", default="10k,1M", help="frame sizes: 10k, 1M and/or 10M"
+    )
+    parser.add_argument("--only", help="run the cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case")
+    parser.add_argument("--save", help="save the timings as a baseline")
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="compare the timings with a baseline, defaults to " + DEFAULT_BASELINE,
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=THRESHOLD, help="slower ratio"
+    )
+    args = parser.parse_args()
+    sizes = args.sizes.split(",")
+    for size in sizes:
+        if size not in SIZES:
+            parser.error("unknown size " + size)
+    # time the operations, not the messages
+    set_verbosity("silent")
+    results = run_cases(sizes, args.only, args.repeat)
+    if args.save is not None:
+        save(results, args.save)
+    if args.compare is not None:
+        if compare(results, args.compare, args.threshold) is False:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
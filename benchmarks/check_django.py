@@ -0,0 +1,151 @@
+"""
+Manual integration check, not a benchmark: it is not timed and is not
+run by the benchmark suite. It checks the Django query loader against
+``pd.DataFrame(list(qs.values()))`` on an in memory SQLite database:
+nullable int, bool and datetime fields, a foreign key, an empty query,
+and the chunked loading
+
+Run it by hand from the repository root, with Django installed::
+
+    python -m benchmarks.check_django
+"""
+
+import datetime
+import sys
+from typing import List
+
+import pandas as pd
+
+try:
+    import django
+    from django.conf import settings
+except ImportError:
+    sys.exit("Please install Django to run this check")
+
+settings.configure(
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    INSTALLED_APPS=[],
+    USE_TZ=True,
+)
+django.setup()
+
+from django.db import connection, models  # noqa: E402
+
+import dataspace  # noqa: E402
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = "check"
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=50)
+    pages = models.IntegerField()
+    rating = models.IntegerField(null=True)
+    price = models.FloatField()
+    available = models.BooleanField()
+    reviewed = models.BooleanField(null=True)
+    published = models.DateTimeField(null=True)
+    author = models.ForeignKey(Author, on_delete=models.CASCADE)
+    editor = models.ForeignKey(
+        Author, null=True, on_delete=models.SET_NULL, related_name="+"
+    )
+
+    class Meta:
+        app_label = "check"
+
+
+# the expected dtype of each column of the loaded frame
+DTYPES = {
+    "id": "int64",
+    "title": "string",
+    "pages": "int64",
+    "rating": "Int64",
+    "price": "float64",
+    "available": "bool",
+    "reviewed": "boolean",
+    "published": "datetime64",
+    "author_id": "int64",
+    "editor_id": "Int64",
+}
+
+
+def _create_data(rows: int) -> None:
+    with connection.schema_editor() as editor:
+        editor.create_model(Author)
+        editor.create_model(Book)
+    authors = Author.objects.bulk_create([Author(name="a" + str(i)) for i in range(3)])
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    books = []
+    for i in range(rows):
+        books.append(
+            Book(
+                title="t" + str(i),
+                pages=i,
+                rating=None if i % 3 == 0 else i % 5,
+                price=i / 2,
+                available=i % 2 == 0,
+                reviewed=None if i % 4 == 0 else i % 2 == 1,
+                published=None if i % 5 == 0 else start + datetime.timedelta(hours=i),
+                author=authors[i % 3],
+                editor=None if i % 2 == 0 else authors[i % 3],
+            )
+        )
+    Book.objects.bulk_create(books)
+
+
+def _values(s: pd.Series) -> list:
+    """
+    Get the values of a serie as Python objects, None for the missing ones
+    """
+    return [None if pd.isna(v) else v for v in s.astype(object)]
+
+
+def _check(name: str, df: pd.DataFrame, query) -> List[str]:
+    errors = []
+    expected = pd.DataFrame(list(query.values()), columns=list(DTYPES))
+    if list(df.columns) != list(expected.columns):
+        return [name + ": columns " + str(list(df.columns))]
+    if len(df.index) != len(expected.index):
+        return [name + ": " + str(len(df.index)) + " rows"]
+    for col, dtype in DTYPES.items():
+        if dtype == "datetime64":
+            ok = pd.api.types.is_datetime64_any_dtype(df[col])
+        elif dtype == "string":
+            # object or str, depending on the pandas version
+            ok = pd.api.types.is_string_dtype(df[col])
+        else:
+            ok = str(df[col].dtype) == dtype
+        if not ok:
+            errors.append(name + ": column " + col + " dtype " + str(df[col].dtype))
+        if _values(df[col]) != _values(expected[col]):
+            errors.append(name + ": column " + col + " values differ")
+    return errors
+
+
+def main() -> int:
+    dataspace.set_verbosity("silent")
+    _create_data(2500)
+    query = Book.objects.all().order_by("id")
+    empty = Book.objects.filter(pages__lt=0)
+    errors = []
+    errors += _check("all", dataspace.from_django(query).df, query)
+    errors += _check("empty", dataspace.from_django(empty).df, empty)
+    chunked = dataspace.from_django(query, chunksize=1000)
+    chunks = [chunk.df for chunk in chunked.chunks_()]
+    if [len(chunk.index) for chunk in chunks] != [1000, 1000, 500]:
+        errors.append("chunks: " + str([len(chunk.index) for chunk in chunks]))
+    errors += _check("chunks", pd.concat(chunks, ignore_index=True), query)
+    for error in errors:
+        print(error)
+    if len(errors) > 0:
+        return 1
+    print("The Django loader matches the query values")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,13 @@
 from dataspace.core import DataSpace
+from dataspace.core.chunked import ChunkedDataSpace
 from dataspace.core.env import is_notebook
-from dataspace.core.load import from_df, from_csv, from_django
+from dataspace.core.load import (
+    from_df,
+    from_csv,
+    from_parquet,
+    from_arrow,
+    from_sql,
+    from_django,
+)
+from dataspace.utils.messages import set_verbosity
+from dataspace.io.diskcache import clear_csv_cache
@@ -1 +1,3 @@
 from .diff import _diffn, _diffp, _diffm, _diffs, _diffsp
+from .rolling import _Rolling, _ZScore, _Ewm
+from .regression import _lreg, _lreg_, _fitted
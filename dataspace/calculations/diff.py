@@ -1,11 +1,21 @@
 from typing import Iterable
 
+import numpy as np
 from numpy import nan
 import pandas as pd
 
 from dataspace.utils.messages import msg_ok
 
 
+def _serie_values(df: pd.DataFrame, serie: Iterable):
+    """
+    Get the serie values matching the dataframe index labels
+    """
+    if not isinstance(serie, pd.Series):
+        serie = pd.Series(serie)
+    return serie.loc[df.index].values
+
+
 def _diffn(
     df: pd.DataFrame,
     diffcol: str,
@@ -14,28 +24,18 @@ def _diffn(
     percent: bool = False,
 ) -> pd.DataFrame:
     try:
-        vals = []
-        i = 0
-        for _, row in df.iterrows():
-            current = row[diffcol]
-            try:
-                nextv = df[diffcol].iloc[i + 1]
-            except Exception:
-                vals.append(nan)
-                continue
-            val: float
-            if percent is False:
-                val = current - nextv
-            else:
-                val = ((current - nextv) * 100) / nextv
-            if doround is True:
-                val = round(val, 2)
-            vals.append(val)
-            i += 1
-        df[name] = vals
+        current = df[diffcol]
+        nextv = current.shift(-1)
+        if percent is False:
+            vals = current - nextv
+        else:
+            vals = ((current - nextv) * 100) / nextv
+        if doround is True:
+            vals = vals.round(2)
+        df[name] = vals.values
     except Exception as e:
         raise Exception("Can not diff column", e)
-    msg_ok("Diff column " + name + " added to the dataframe")
+    msg_ok("Diff column", name, "added to the dataframe")
     return df
 
 
@@ -47,27 +47,20 @@ def _diffp(
     percent: bool = False,
 ) -> pd.DataFrame:
     try:
-        previous = 0
-        i = 0
-        vals = [df[diffcol].iloc[0]]
-        for _, row in df.iterrows():
-            if i == 0:
-                vals = [0]
-            else:
-                val: float
-                if percent is False:
-                    val = row[diffcol] - previous
-                else:
-                    val = ((row[diffcol] - previous) * 100) / previous
-                if doround is True:
-                    val = round(val, 2)
-                vals.append(val)
-            previous = row[diffcol]
-            i = 1
+        values = df[diffcol].to_numpy()
+        current = values[1:]
+        previous = values[:-1]
+        if percent is False:
+            vals = current - previous
+        else:
+            vals = ((current - previous) * 100) / previous
+        if doround is True:
+            vals = np.round(vals, 2)
+        vals = np.concatenate(([0], vals))
         df[name] = vals
     except Exception as e:
-        raise ("Can not diff column", e)
-    msg_ok("Diff column " + name + " added to the dataframe")
+        raise Exception("Can not diff column", e)
+    msg_ok("Diff column", name, "added to the dataframe")
     return df
 
 
@@ -80,25 +73,18 @@ def _diffm(
     percent: bool = False,
 ) -> pd.DataFrame:
     try:
-        mean = df[diffcol].mean()
-        vals = []
-        for _, row in df.iterrows():
-            num = row[diffcol]
-            if num > 0:
-                diff: str
-                if percent is True:
-                    diff = num - mean
-                else:
-                    diff = ((num - mean) * 100) / mean
-                if doround is True:
-                    diff = round(diff, 2)
-                vals.append(diff)
-            else:
-                vals.append(default)
-        df[name] = vals
+        num = df[diffcol]
+        mean = num.mean()
+        if percent is True:
+            diff = num - mean
+        else:
+            diff = ((num - mean) * 100) / mean
+        if doround is True:
+            diff = diff.round(2)
+        df[name] = diff.where(num > 0, default).values
     except Exception as e:
         raise Exception("Can not diff column", e)
-    msg_ok("Diff column " + name + " added to the dataframe")
+    msg_ok("Diff column", name, "added to the dataframe")
     return df
 
 
@@ -106,14 +92,10 @@ def _diffs(
     df: pd.DataFrame, col: str, serie: Iterable, name: str = "Diff"
 ) -> pd.DataFrame:
     try:
-        d = []
-        for i, row in df.iterrows():
-            v = row[col] - serie[i]
-            d.append(v)
-        df[name] = d
+        df[name] = df[col].values - _serie_values(df, serie)
     except Exception as e:
         raise Exception("Can not diff column from serie", e)
-    msg_ok("Diff column " + name + " added to the dataframe")
+    msg_ok("Diff column", name, "added to the dataframe")
     return df
 
 
@@ -121,12 +103,8 @@ def _diffsp(
     df: pd.DataFrame, col: str, serie: Iterable, name: str = "Diff"
 ) -> pd.DataFrame:
     try:
-        d = []
-        for i, row in df.iterrows():
-            v = (row[col] * 100) / serie[i]
-            d.append(v)
-        df[name] = d
+        df[name] = (df[col].values * 100) / _serie_values(df, serie)
     except Exception as e:
         raise Exception("Can not diff column from serie", e)
-    msg_ok("Diff column " + name + " added to the dataframe")
+    msg_ok("Diff column", name, "added to the dataframe")
     return df
@@ -1,3 +1,98 @@
-def _regression(x, y):
-    # TODO
-    pass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from dataspace.utils.messages import msg_ok
+
+
+def _numeric(serie: pd.Series) -> np.ndarray:
+    """
+    Get float values from a numeric or date serie
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        vals = serie.astype("int64").to_numpy(dtype=float)
+        vals[serie.isna().to_numpy()] = np.nan
+        return vals
+    return serie.to_numpy(dtype=float)
+
+
+def _fit(
+    x: np.ndarray, y: np.ndarray, codes: np.ndarray, ngroups: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Least squares fit of y = slope * x + intercept for all the groups at
+    once: the per group sums are computed with ``np.bincount``
+    """
+    valid = ~(np.isnan(x) | np.isnan(y)) & (codes >= 0)
+    x, y, codes = x[valid], y[valid], codes[valid]
+    count = np.bincount(codes, minlength=ngroups).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = np.bincount(codes, x, ngroups) / count
+        mean_y = np.bincount(codes, y, ngroups) / count
+        dx = x - mean_x[codes]
+        dy = y - mean_y[codes]
+        sxx = np.bincount(codes, dx * dx, ngroups)
+        sxy = np.bincount(codes, dx * dy, ngroups)
+        syy = np.bincount(codes, dy * dy, ngroups)
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        r2 = (sxy * sxy) / (sxx * syy)
+    return slope, intercept, r2, count
+
+
+def _groups(df: pd.DataFrame, by: str = None) -> Tuple[np.ndarray, pd.Index]:
+    if by is None:
+        return np.zeros(len(df.index), dtype=np.int64), pd.Index(["all"])
+    codes, uniques = pd.factorize(df[by], sort=True)
+    return codes, pd.Index(uniques, name=by)
+
+
+def _lreg_(df: pd.DataFrame, x: str, y: str, by: str = None) -> pd.DataFrame:
+    """
+    Linear regression coefficients of y over x, for each group of the by
+    column
+    """
+    try:
+        codes, keys = _groups(df, by)
+        slope, intercept, r2, count = _fit(
+            _numeric(df[x]), _numeric(df[y]), codes, len(keys)
+        )
+        return pd.DataFrame(
+            {
+                "slope": slope,
+                "intercept": intercept,
+                "r2": r2,
+                "count": count.astype(np.int64),
+            },
+            index=keys,
+        )
+    except Exception as e:
+        raise Exception("Can not compute linear regression", e)
+
+
+def _fitted(df: pd.DataFrame, x: str, y: str, by: str = None) -> np.ndarray:
+    """
+    Values fitted by a linear regression of y over x, for each group
+    of the by column
+    """
+    codes, keys = _groups(df, by)
+    xvals = _numeric(df[x])
+    slope, intercept, _, _ = _fit(xvals, _numeric(df[y]), codes, len(keys))
+    fitted = slope[codes] * xvals + intercept[codes]
+    fitted[codes < 0] = np.nan
+    return fitted
+
+
+def _lreg(
+    df: pd.DataFrame, x: str, y: str, by: str = None, name: str = "Regression"
+) -> pd.DataFrame:
+    """
+    Add a column with the values fitted by a linear regression of y over x
+    """
+    try:
+        df[name] = _fitted(df, x, y, by)
+    except Exception as e:
+        raise Exception("Can not compute linear regression", e)
+    msg_ok("Regression column", name, "added to the dataframe")
+    return df
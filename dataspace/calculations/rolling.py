@@ -0,0 +1,107 @@
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+AGGREGATIONS = ("mean", "sum", "std", "var", "min", "max", "median", "count")
+
+
+class _Rolling:
+    """
+    Rolling window aggregation over consecutive chunks of rows. The rows of
+    the previous chunk that are still in the window are kept, so that the
+    results are the same as for the whole data in one frame
+    """
+
+    def __init__(
+        self, col: str, window: Union[int, str], agg: str = "mean", on: str = None
+    ) -> None:
+        if agg not in AGGREGATIONS:
+            raise Exception("Rolling aggregation " + str(agg) + " unknown")
+        self.col = col
+        self.window = window
+        self.agg = agg
+        self.on = on
+        self._tail = None
+
+    def _serie(self, df: pd.DataFrame) -> pd.Series:
+        values = df[self.col].to_numpy(dtype=float)
+        if self.on is not None:
+            return pd.Series(values, index=pd.DatetimeIndex(df[self.on]))
+        return pd.Series(values)
+
+    def _compute(self, serie: pd.Series) -> pd.Series:
+        return getattr(serie.rolling(self.window), self.agg)()
+
+    def _keep_tail(self, serie: pd.Series) -> pd.Series:
+        if isinstance(self.window, int):
+            return serie.iloc[max(0, len(serie.index) - self.window + 1) :]
+        if len(serie.index) == 0:
+            return serie
+        start = serie.index[-1] - pd.Timedelta(self.window)
+        return serie[serie.index > start]
+
+    def apply(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Compute the values for a chunk of rows
+        """
+        try:
+            serie = self._serie(df)
+            skip = 0
+            if self._tail is not None:
+                skip = len(self._tail.index)
+                serie = pd.concat([self._tail, serie])
+            res = self._compute(serie)
+            self._tail = self._keep_tail(serie)
+            return res.to_numpy()[skip:]
+        except Exception as e:
+            raise Exception("Can not compute rolling window", e)
+
+
+class _ZScore(_Rolling):
+    """
+    Moving z-score: distance of each value to the rolling mean, in
+    rolling standard deviations
+    """
+
+    def __init__(self, col: str, window: Union[int, str], on: str = None) -> None:
+        super().__init__(col, window, "mean", on)
+
+    def _compute(self, serie: pd.Series) -> pd.Series:
+        rolling = serie.rolling(self.window)
+        return (serie - rolling.mean()) / rolling.std()
+
+
+class _Ewm:
+    """
+    Exponentially weighted mean over consecutive chunks of rows, in its
+    recursive form (``adjust=False``): the last mean and the following
+    missing values are carried to the next chunk
+    """
+
+    def __init__(self, col: str, span: float) -> None:
+        self.col = col
+        self.span = span
+        self._tail = None
+
+    def apply(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Compute the values for a chunk of rows
+        """
+        try:
+            values = df[self.col].to_numpy(dtype=float)
+            skip = 0
+            if self._tail is not None:
+                skip = len(self._tail)
+                values = np.concatenate([self._tail, values])
+            res = pd.Series(values).ewm(span=self.span, adjust=False).mean()
+            res = res.to_numpy()
+            valid = np.flatnonzero(~np.isnan(values))
+            if len(valid) > 0:
+                last = valid[-1]
+                self._tail = np.concatenate([[res[last]], values[last + 1 :]])
+            else:
+                self._tail = values
+            return res[skip:]
+        except Exception as e:
+            raise Exception("Can not compute exponentially weighted mean", e)
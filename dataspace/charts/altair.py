@@ -3,8 +3,8 @@ import numpy as np
 import pandas as pd
 from altair import Chart, X, Y, Scale, Axis, data_transformers
 
-from dataspace.transform import _drop
 from dataspace.core.env import is_notebook
+from .base import REGRESSION_COL
 
 data_transformers.disable_max_rows()
 
@@ -23,7 +23,7 @@ class AltairChart:
                 pass"""
 
     def chart(
-        self, df: pd.DataFrame, chart_type, opts={}, style={}, encode={}
+        self, df: pd.DataFrame, chart_type, opts={}, style={}, encode={}, by=None
     ) -> Chart:
         """
         Get an Altair chart object
@@ -54,6 +54,8 @@ class AltairChart:
             )
         elif chart_type == "hline":
             chart = self._altair_hline_(df, opts, style, encode)
+        elif chart_type == "lreg":
+            chart = self._altair_lreg_(df, by, opts, style, encode)
         elif chart_type == "line_num":
             chart = self._altair_chart_num_(df, "line", opts, style, encode)
         elif chart_type == "bar_num":
@@ -172,13 +174,7 @@ class AltairChart:
             rawy = self.y.shorthand
             if ":" in self.y.shorthand:
                 rawy = self.y.shorthand.split(":")[0]
-            mean = df[rawy].mean()
-            lx = []
-            i = 0
-            while i < len(df[rawy]):
-                lx.append(mean)
-                i += 1
-            df["Mean"] = lx
+            df = df.assign(Mean=df[rawy].mean())
             # hx = X(self.x.title, axis=None)
             chart = (
                 Chart(df)
@@ -186,11 +182,37 @@ class AltairChart:
                 .encode(x=self.x, y="Mean:Q", **encode)
                 .properties(**opts)
             )
-            _drop(df, "Mean")
             return chart
         except Exception as e:
             raise Exception("Can not draw mean line chart", e)
 
+    def _altair_lreg_(self, df: pd.DataFrame, by: str, opts, style, encode) -> Chart:
+        """
+        Get a points chart with the regression lines overlay
+        """
+        encode = dict(encode)
+        if by is not None and "color" not in encode:
+            encode["color"] = by
+        points = (
+            Chart(df)
+            .mark_point(**style)
+            .encode(x=self.x, y=self.y, **encode)
+            .properties(**opts)
+        )
+        line_style = {}
+        line_encode = {}
+        if "color" in encode:
+            line_encode["color"] = encode["color"]
+        else:
+            line_style["color"] = "#FC4F30"
+        lines = (
+            Chart(df)
+            .mark_line(**line_style)
+            .encode(x=self.x, y=Y(REGRESSION_COL + ":Q", title=None), **line_encode)
+            .properties(**opts)
+        )
+        return points + lines
+
     def set_axis(self, xaxis: Union[str, X], yaxis: Union[str, X]) -> None:
         if isinstance(xaxis, X):
             self.x = xaxis
@@ -1,17 +1,49 @@
+from typing import TYPE_CHECKING, List
+
 import pandas as pd
-from altair import Chart
-from .altair import AltairChart
-from .bokeh import BokehChart
+
+from dataspace.calculations import _fitted
+from .downsample import _downsample
+
+if TYPE_CHECKING:
+    from .altair import AltairChart
+    from .bokeh import BokehChart
+
+
+# chart types drawn from every data point, that can be downsampled
+DOWNSAMPLE_CHARTS = ("line", "area", "point", "lreg")
+
+# column of the values fitted by the regression chart
+REGRESSION_COL = "Regression"
+
+
+def _axis_cols(axis) -> List[str]:
+    """
+    Get the columns names of a chart axis
+    """
+    if isinstance(axis, list):
+        return [str(col) for col in axis]
+    if hasattr(axis, "shorthand"):
+        axis = axis.shorthand
+    return [str(axis).split(":")[0]]
 
 
 class DsChart:
     engine = "bokeh"
     default_width = 950
-    altair: AltairChart = None
-    bokeh: BokehChart = None
+    # the line, area and point charts with more rows than the threshold
+    # are downsampled with the minmax or lttb method. None to disable
+    downsample = "minmax"
+    downsample_threshold = 10000
+    altair: "AltairChart" = None
+    bokeh: "BokehChart" = None
+    x_cols: List[str] = None
+    y_cols: List[str] = None
 
     def set_axis(self, x_axis_col: str, y_axis_col: str):
         self._check_engine()
+        self.x_cols = _axis_cols(x_axis_col)
+        self.y_cols = _axis_cols(y_axis_col)
         if self.engine == "altair":
             return self.altair.set_axis(x_axis_col, y_axis_col)
         elif self.engine == "bokeh":
@@ -19,15 +51,38 @@ class DsChart:
 
     def chart(self, df: pd.DataFrame, chart_type, **kwargs):
         self._check_engine()
+        method = kwargs.pop("downsample", self.downsample)
+        if chart_type == "lreg":
+            # fit on all the rows, before downsampling the points
+            by = kwargs.pop("by", None)
+            fitted = _fitted(df, self.x_cols[0], self.y_cols[0], by)
+            df = df.assign(**{REGRESSION_COL: fitted})
+            kwargs["by"] = by
+        if self._can_downsample(df, chart_type, method):
+            df = _downsample(df, self.x_cols, self.y_cols, self.default_width, method)
         if self.engine == "altair":
             return self.altair.chart(df, chart_type, **kwargs)
         elif self.engine == "bokeh":
             return self.bokeh.chart(df, chart_type, **kwargs)
 
+    def _can_downsample(self, df: pd.DataFrame, chart_type, method) -> bool:
+        if method is None or method is False or chart_type not in DOWNSAMPLE_CHARTS:
+            return False
+        if len(df.index) <= self.downsample_threshold or self.y_cols is None:
+            return False
+        cols = df.columns
+        return all(col in cols for col in self.x_cols + self.y_cols)
+
     def _check_engine(self):
+        # the charts libraries are heavy to import: load them only
+        # when an engine is used for the first time
         if self.engine == "altair":
             if self.altair is None:
+                from .altair import AltairChart
+
                 self.altair = AltairChart(self.default_width)
         elif self.engine == "bokeh":
             if self.bokeh is None:
+                from .bokeh import BokehChart
+
                 self.bokeh = BokehChart(self.default_width)
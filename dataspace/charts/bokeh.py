@@ -3,6 +3,7 @@ import pandas as pd
 import holoviews as hv
 from holoviews.core.data.interface import DataError
 from dataspace.core.env import is_notebook
+from .base import REGRESSION_COL
 
 hv.extension("bokeh")
 
@@ -15,7 +16,7 @@ class BokehChart:
     def __init__(self, default_width: int) -> None:
         self.default_width = default_width
 
-    def chart(self, df: pd.DataFrame, chart_type, **kwargs):
+    def chart(self, df: pd.DataFrame, chart_type, by: str = None, **kwargs):
         """
         Get a Bokeh chart object
         """
@@ -30,7 +31,7 @@ class BokehChart:
             if chart_type == "line":
                 chart = hv.Curve(**args)
             elif chart_type == "hline":
-                chart = hv.HLine(float(df[self.y].mean()))
+                chart = hv.HLine(float(df[self.y[0]].mean()))
             elif chart_type == "point":
                 chart = hv.Scatter(**args)
             elif chart_type == "area":
@@ -43,8 +44,8 @@ class BokehChart:
                 chart = hv.ErrorBars(**args)
             elif chart_type == "heatmap":
                 chart = hv.HeatMap(**args)
-            # elif chart_type == "lreg":
-            #    chart = self._lreg_bokeh(**args)
+            elif chart_type == "lreg":
+                return self._lreg_bokeh(df, by, opts)
             elif chart_type == "sline":
                 # window_size, y_label = (options["window_size"],)
                 # options["y_label"]
@@ -59,6 +60,27 @@ class BokehChart:
         except Exception as e:
             raise e
 
+    def _lreg_bokeh(self, df: pd.DataFrame, by: str, opts: Dict):
+        """
+        Get a points chart with the regression lines overlay
+        """
+        points = hv.Scatter(df, kdims=self.x, vdims=self.y).opts(**opts)
+        df = df.sort_values(self.x[0])
+        if by is None:
+            lines = hv.Curve(df, kdims=self.x, vdims=[REGRESSION_COL]).opts(
+                color="#FC4F30"
+            )
+        else:
+            lines = hv.Overlay(
+                [
+                    hv.Curve(
+                        group, kdims=self.x, vdims=[REGRESSION_COL], label=str(key)
+                    )
+                    for key, group in df.groupby(by)
+                ]
+            )
+        return points * lines
+
     def set_axis(self, xaxis, yaxis) -> None:
         if isinstance(xaxis, list):
             self.x = xaxis
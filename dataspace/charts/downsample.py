@@ -0,0 +1,97 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+def _x_values(df: pd.DataFrame, x_cols: List[str]) -> np.ndarray:
+    """
+    Get the x axis as floats, NaN for the missing values. The row
+    positions are used for a non numeric axis
+    """
+    if len(x_cols) == 1:
+        x = df[x_cols[0]]
+        if pd.api.types.is_datetime64_any_dtype(x):
+            vals = x.astype("int64").to_numpy(dtype=float)
+            vals[x.isna().to_numpy()] = np.nan
+            return vals
+        if pd.api.types.is_numeric_dtype(x) and not pd.api.types.is_bool_dtype(x):
+            return x.to_numpy(dtype=float, na_value=np.nan)
+    return np.arange(len(df.index), dtype=float)
+
+
+def _minmax(
+    df: pd.DataFrame, x_cols: List[str], y_cols: List[str], buckets: int
+) -> pd.DataFrame:
+    """
+    Keep the first, last, min and max points of each bucket of the x axis:
+    the buckets are equal ranges of x values, like the pixels columns
+    """
+    x = _x_values(df, x_cols)
+    pos = np.flatnonzero(~np.isnan(x))
+    if len(pos) == 0:
+        return df.iloc[pos]
+    x = x[pos]
+    edges = np.linspace(x.min(), x.max(), buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, buckets - 1)
+    xs = pd.Series(x, index=pos)
+    keep = [
+        xs.groupby(bucket).idxmin().to_numpy(),
+        xs.groupby(bucket).idxmax().to_numpy(),
+    ]
+    for col in y_cols:
+        ys = pd.Series(df[col].to_numpy(dtype=float, na_value=np.nan)[pos], index=pos)
+        valid = ys.notna().to_numpy()
+        groups = ys[valid].groupby(bucket[valid])
+        keep += [groups.idxmin().to_numpy(), groups.idxmax().to_numpy()]
+    # the kept rows are in their original order
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+
+def _lttb(df: pd.DataFrame, x_col: str, y_col: str, threshold: int) -> pd.DataFrame:
+    """
+    Largest triangle three buckets: keep the point of each bucket that forms
+    the largest triangle with the previous kept point and the next
+    bucket average. The points are taken in the x axis order
+    """
+    x = _x_values(df, [x_col])
+    y = df[y_col].to_numpy(dtype=float, na_value=np.nan)
+    pos = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    pos = pos[np.argsort(x[pos], kind="stable")]
+    x, y = x[pos], y[pos]
+    n = len(pos)
+    if n <= threshold or threshold < 3:
+        return df.iloc[np.sort(pos)]
+    every = (n - 2) / (threshold - 2)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(areas.argmax())
+        keep[i + 1] = a
+    keep[-1] = n - 1
+    return df.iloc[np.sort(pos[keep])]
+
+
+def _downsample(
+    df: pd.DataFrame, x_cols: List[str], y_cols: List[str], width: int, method: str
+) -> pd.DataFrame:
+    try:
+        if method == "minmax":
+            return _minmax(df, x_cols, y_cols, width)
+        elif method == "lttb":
+            if len(x_cols) != 1 or len(y_cols) != 1:
+                return _minmax(df, x_cols, y_cols, width)
+            return _lttb(df, x_cols[0], y_cols[0], width * 2)
+        raise Exception("Downsampling method " + method + " unknown")
+    except Exception as e:
+        raise Exception("Can not downsample data", e)
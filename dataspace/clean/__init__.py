@@ -1,4 +1,4 @@
-from .convert import _to_int, _to_float, _to_type
+from .convert import _to_int, _to_float, _to_type, _optimize_
 from .nulls import _drop_nan, _fill_nan, _fill_nulls
 from .dates import _to_date, _fdate, _timestamps
-from .values import _strip, _strip_cols, _roundvals, _replace
+from .values import _strip, _strip_cols, _roundvals, _replace, _clean
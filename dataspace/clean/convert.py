@@ -27,3 +27,43 @@ def _to_type(df: pd.DataFrame, dtype: type, *cols, **kwargs):
             df[col] = df[col].astype(dtype, **kwargs)
     except Exception as e:
         raise Exception("Can not convert to type", e)
+
+
+def _downcast_serie(serie: pd.Series, category_ratio: float) -> pd.Series:
+    if pd.api.types.is_bool_dtype(serie):
+        return serie
+    if pd.api.types.is_integer_dtype(serie):
+        return pd.to_numeric(serie, downcast="integer")
+    if pd.api.types.is_float_dtype(serie):
+        small = serie.astype(np.float32)
+        # only downcast when no precision is lost
+        same = (small.astype(np.float64) == serie) | serie.isnull()
+        if same.all():
+            return small
+        return serie
+    if pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+        if len(serie.index) > 0 and serie.nunique() / len(serie.index) < category_ratio:
+            return serie.astype("category")
+    return serie
+
+
+def _optimize_(df: pd.DataFrame, *cols: str, category_ratio: float = 0.5):
+    if len(cols) == 0:
+        cols = df.columns.values
+    rows = {}
+    try:
+        for col in cols:
+            before = df[col]
+            after = _downcast_serie(before, category_ratio)
+            df[col] = after
+            rows[col] = {
+                "dtype_before": str(before.dtype),
+                "dtype_after": str(after.dtype),
+                "bytes_before": int(before.memory_usage(index=False, deep=True)),
+                "bytes_after": int(after.memory_usage(index=False, deep=True)),
+            }
+    except Exception as e:
+        raise Exception("Can not optimize columns", e)
+    # the columns are set for the report of a dataframe without columns
+    cols = ["dtype_before", "dtype_after", "bytes_before", "bytes_after"]
+    return pd.DataFrame.from_dict(rows, orient="index", columns=cols)
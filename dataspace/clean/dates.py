@@ -1,40 +1,81 @@
 import numpy as np
 import pandas as pd
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# precision -> (date format, truncation frequency)
+PRECISIONS = {
+    "S": ("%Y-%m-%d %H:%M:%S", "s"),
+    "Min": ("%Y-%m-%d %H:%M", "min"),
+    "H": ("%Y-%m-%d %H", "h"),
+    "D": ("%Y-%m-%d", "D"),
+    "M": ("%Y-%m", None),
+    "Y": ("%Y", None),
+}
+
+# number of distinct values used to sniff the date format
+SNIFF_SAMPLE = 20
+
+
+def _sniff_format(values, dayfirst: bool = False) -> str:
+    """
+    Guess the date format of a sample of string values. Returns None
+    if the format can not be guessed or differs between values
+    """
+    formats = set()
+    for val in values[:SNIFF_SAMPLE]:
+        if not isinstance(val, str):
+            return None
+        formats.add(guess_datetime_format(val, dayfirst=dayfirst))
+    if len(formats) != 1:
+        return None
+    return formats.pop()
+
+
+def _parse_dates(serie: pd.Series, **kwargs) -> pd.Series:
+    """
+    Parse each distinct value of a serie only once
+    """
+    codes, uniques = pd.factorize(serie)
+    if "format" not in kwargs:
+        fmt = _sniff_format(uniques, kwargs.get("dayfirst", False))
+        if fmt is not None:
+            kwargs["format"] = fmt
+    parsed = pd.DatetimeIndex(pd.to_datetime(uniques, **kwargs))
+    dates = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(dates, index=serie.index, name=serie.name)
+
 
 def _to_date(df: pd.DataFrame, *cols: str, **kwargs):
     try:
         for col in cols:
-            df[col] = pd.to_datetime(df[col], **kwargs)
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], **kwargs)
+            else:
+                df[col] = _parse_dates(df[col], **kwargs)
     except Exception as e:
         raise Exception("Can not convert to date", e)
 
 
 def _fdate(df: pd.DataFrame, *cols, precision: str = "S", format: str = None):
-    def formatdate(row):
-        return row.strftime(format)
-
-    def convert(row):
-        encoded = "%Y-%m-%d %H:%M:%S"
-        if precision == "Min":
-            encoded = "%Y-%m-%d %H:%M"
-        elif precision == "H":
-            encoded = "%Y-%m-%d %H"
-        elif precision == "D":
-            encoded = "%Y-%m-%d"
-        elif precision == "M":
-            encoded = "%Y-%m"
-        elif precision == "Y":
-            encoded = "%Y"
-        return row.strftime(encoded)
-
+    freq = None
+    if format is None:
+        format, freq = PRECISIONS.get(precision, PRECISIONS["S"])
     try:
         for f in cols:
             try:
-                if format is None:
-                    df[f] = pd.to_datetime(df[f]).apply(convert)
-                else:
-                    df[f] = pd.to_datetime(df[f]).apply(formatdate)
+                dates = pd.to_datetime(df[f])
+                if freq is not None and dates.dt.tz is None:
+                    dates = dates.dt.floor(freq)
+                # format each distinct date only once
+                codes, uniques = pd.factorize(dates)
+                formatted = np.asarray(uniques.strftime(format), dtype=object)
+                vals = formatted.take(codes)
+                vals[codes == -1] = np.nan
+                df[f] = vals
             except ValueError as e:
                 raise Exception("Can not convert date", e)
     except KeyError:
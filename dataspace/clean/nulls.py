@@ -16,11 +16,11 @@ def _fill_nan(df: pd.DataFrame, val, *cols: str) -> None:
     if len(cols) == 0:
         cols = df.columns.values
     for col in cols:
-        df[col].fillna(val, inplace=True)
+        df[col] = df[col].fillna(val)
 
 
 def _fill_nulls(df: pd.DataFrame, val, *cols: str, nulls):
     if len(cols) == 0:
         cols = df.columns.values
     for col in cols:
-        df[col].replace(nulls, val, inplace=True)
+        df[col] = df[col].replace(nulls, val)
@@ -1,14 +1,26 @@
+from typing import Dict, List, Union
+
 import pandas as pd
+from pandas.api.types import is_string_dtype
 
+from dataspace.utils.messages import msg_warning, _Joined
+
+
+def _strip_serie(serie: pd.Series) -> pd.Series:
+    if not is_string_dtype(serie):
+        # convert the values to strings, keeping the missing values
+        serie = serie.astype(str).where(serie.notna())
+    return serie.str.strip()
 
-def _strip(df: pd.DataFrame, *cols: str):
-    def remove_ws(row):
-        row = str(row).strip()
-        return row
 
+def _round_serie(serie: pd.Series, precision: int = 2) -> pd.Series:
+    return serie.astype("float64").round(precision)
+
+
+def _strip(df: pd.DataFrame, *cols: str):
     try:
         for col in cols:
-            df[col] = df[col].apply(remove_ws)
+            df[col] = _strip_serie(df[col])
     except Exception as e:
         raise Exception("Can not remove white space in column", e)
 
@@ -23,19 +35,50 @@ def _strip_cols(df: pd.DataFrame):
             skipped.append(str(col))
     df.rename(columns=cols, inplace=True)
     if len(skipped) > 0:
-        print("Skipped columns", ",".join(skipped), "while removing white spaces")
+        msg_warning(
+            "Skipped columns", _Joined(",", skipped), "while removing white spaces"
+        )
 
 
-def _roundvals(df: pd.DataFrame, col: str, precision: int):
+def _roundvals(df: pd.DataFrame, col: Union[str, List[str]], precision: int):
     try:
-        df[col] = df[col].astype("float64")
-        df[col] = df[col].apply(lambda x: round(x, precision))
+        df[col] = _round_serie(df[col], precision)
     except Exception as e:
         raise Exception("Can not round column values", e)
 
 
-def _replace(df: pd.DataFrame, col: str, searchval: str, replaceval: str):
+def _replace(
+    df: pd.DataFrame, col: Union[str, List[str]], searchval: str, replaceval: str
+):
     try:
         df[col] = df[col].replace(searchval, replaceval)
     except Exception as e:
         raise Exception("Can not replace value in column", e)
+
+
+# cleaning operations available in a spec: name -> function taking a
+# serie and the operation arguments
+CLEANERS = {
+    "strip": _strip_serie,
+    "roundvals": _round_serie,
+    "replace": lambda serie, searchval, replaceval: serie.replace(
+        searchval, replaceval
+    ),
+    "fill_nan": lambda serie, val: serie.fillna(val),
+}
+
+
+def _clean(df: pd.DataFrame, spec: Dict[str, list]):
+    try:
+        for col, ops in spec.items():
+            serie = df[col]
+            for op in ops:
+                if isinstance(op, str):
+                    op = (op,)
+                name, args = op[0], op[1:]
+                if name not in CLEANERS:
+                    raise Exception("Cleaning operation " + str(name) + " unknown")
+                serie = CLEANERS[name](serie, *args)
+            df[col] = serie
+    except Exception as e:
+        raise Exception("Can not clean columns", e)
@@ -1,17 +1,29 @@
-from typing import Dict, Iterable, List
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Union
 
 from numpy import nan
 import pandas as pd
 
-from dataspace.charts.base import DsChart
 from dataspace.core.env import is_notebook
+from dataspace.core.cache import _cached
+from dataspace.core.mutation import _mutating
+from dataspace.core.plan import Operation, _optimize_plan
+from dataspace.core.trace import Span, _traced, _trace_, _export_trace
 from dataspace.charts import DsChart
-from dataspace.io.export import _export_csv
+from dataspace.io.export import (
+    _export_csv,
+    _export_csv_parts,
+    _export_parquet,
+    _export_feather,
+    _export_sql,
+)
 from dataspace.clean import (
     _to_date,
     _to_int,
     _to_float,
     _to_type,
+    _optimize_,
     _drop_nan,
     _fill_nan,
     _fill_nulls,
@@ -21,23 +33,78 @@ from dataspace.clean import (
     _strip_cols,
     _roundvals,
     _replace,
+    _clean,
+)
+from dataspace.count import (
+    _count_empty_,
+    _count_null_,
+    _count_unique_,
+    _count_zero_,
+    _profile_,
+)
+from dataspace.transform import (
+    _drop,
+    _rename,
+    _append,
+    _apply,
+    _rsum,
+    _rmean,
+    _split,
+    _map_groups,
+    IncrementalResampler,
+)
+from dataspace.utils.messages import msg_ok, _Joined
+from dataspace.calculations import (
+    _diffn,
+    _diffp,
+    _diffm,
+    _diffs,
+    _diffsp,
+    _Rolling,
+    _ZScore,
+    _Ewm,
+    _lreg,
+    _lreg_,
 )
-from dataspace.count import _count_empty_, _count_null_, _count_unique_, _count_zero_
-from dataspace.transform import _drop, _rename, _append, _apply, _rsum, _rmean
-from dataspace.utils.messages import msg_ok
-from dataspace.calculations import _diffn, _diffp, _diffm, _diffs, _diffsp
 from dataspace.info.view import _show
-from dataspace.info import _cols
+from dataspace.info import _cols, _memory_
 
 
 class DataSpace:
-    df: pd.DataFrame = None
+    _df: pd.DataFrame = None
     _chartEngine: DsChart = None
+    _lazy: bool = False
+    _plan: List[Operation] = None
+    _inplace: bool = False
+    _owned: bool = False
+    _rows: List[list] = None
+    _rows_index: list = None
+    append_batch: int = 10000
+    _version: int = 0
+    _cache: OrderedDict = None
+    _cache_hits: int = 0
+    _cache_misses: int = 0
+    cache_size: int = 128
+    _tracing: bool = False
+    _trace: List[Span] = None
+    _trace_start: float = 0
+    _trace_depth: int = 0
 
     def __init__(self, df: pd.DataFrame = None) -> None:
+        self._cache = OrderedDict()
+        self._plan = []
+        self._rows = []
+        self._rows_index = []
+        self._trace = []
         self.df = df
 
     def __repr__(self) -> str:
+        if len(self._plan) > 0:
+            return (
+                "<DataSpace object | lazy | "
+                + str(len(self._plan))
+                + " pending operations>"
+            )
         num = 0
         if self.df is not None:
             num = len(self.df.index)
@@ -47,6 +114,206 @@ class DataSpace:
             return str(self.df.head(5))
         return msg
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        The main dataframe. Pending lazy operations are executed
+        before it is returned
+        """
+        if len(self._plan) > 0:
+            self._run_plan()
+        if len(self._rows) > 0:
+            self.flush()
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        self._df = df
+        self._owned = False
+        self._changed()
+
+    def _changed(self) -> None:
+        """
+        Bump the main dataframe version and invalidate the cached results
+        """
+        self._version += 1
+        self._cache.clear()
+
+    # **************************
+    #          cache
+    # **************************
+
+    def cache_(self) -> Dict[str, int]:
+        """
+        Returns the statistics of the read only queries cache. The results
+        of ``cols_``, ``unique_``, ``wunique_``, ``count_*_`` and
+        ``profile_`` are cached until the main dataframe is modified by a
+        DataSpace method, replaced, or gets new rows or columns. Call
+        ``ds.cache_clear()`` after changing values of ``ds.df`` directly
+
+        :return: the number of hits, misses and cached results
+        :rtype: ``Dict[str, int]``
+
+        :example: `ds.cache_()`
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+            "version": self._version,
+        }
+
+    def cache_clear(self) -> None:
+        """
+        Empty the read only queries cache
+
+        :example: `ds.cache_clear()`
+        """
+        self._changed()
+
+    # **************************
+    #          memory
+    # **************************
+
+    def cow(self) -> None:
+        """
+        Use the copy on write policy (default): the dataframe passed to the
+        DataSpace is never modified. The DataSpace works on a shallow copy
+        that shares the data with it until a column is changed
+
+        :example: `ds.cow()`
+        """
+        self._inplace = False
+        self._owned = False
+
+    def inplace(self) -> None:
+        """
+        Use the in place policy: the methods modify the main dataframe
+        object directly, including a dataframe passed to the DataSpace,
+        without keeping a copy. The rows filters, like ``exclude`` and
+        ``limit``, build a new dataframe with both policies: it is faster
+        and uses less memory than a pandas in place drop
+
+        :example: `ds.inplace()`
+        """
+        self._inplace = True
+
+    @_traced
+    def memory_(self) -> pd.DataFrame:
+        """
+        Returns the memory used by the index and each column of the
+        main dataframe
+
+        :return: a dataframe with the number of bytes used per column
+        :rtype: ``pd.DataFrame``
+
+        :example: `ds.memory_()`
+        """
+        return _memory_(self.df)
+
+    # **************************
+    #           lazy
+    # **************************
+
+    def lazy(self) -> None:
+        """
+        Switch to lazy mode: the operations that modify the main dataframe
+        are recorded in a query plan instead of being executed. The plan
+        is optimized and executed at once by ``collect``, or when the main
+        dataframe is read
+
+        :example: `ds.lazy()`
+        """
+        self._lazy = True
+
+    @_traced
+    def collect(self) -> None:
+        """
+        Execute the recorded query plan and leave the lazy mode
+
+        :example: `ds.collect()`
+        """
+        self._run_plan()
+        self._lazy = False
+
+    def plan_(self) -> List[str]:
+        """
+        Returns the optimized query plan waiting for execution
+
+        :return: a list of operations
+        :rtype: ``List[str]``
+
+        :example: `ds.plan_()`
+        """
+        plan = []
+        for name, args, kwargs in _optimize_plan(self._plan):
+            params = [repr(arg) for arg in args]
+            params += [k + "=" + repr(v) for k, v in kwargs.items()]
+            plan.append(name + "(" + ", ".join(params) + ")")
+        return plan
+
+    def _run_plan(self) -> None:
+        plan = _optimize_plan(self._plan)
+        self._plan = []
+        lazy = self._lazy
+        self._lazy = False
+        try:
+            for name, args, kwargs in plan:
+                getattr(self, name)(*args, **kwargs)
+        finally:
+            self._lazy = lazy
+
+    # **************************
+    #          trace
+    # **************************
+
+    def trace(self, enabled: bool = True) -> None:
+        """
+        Start or stop recording the calls of the DataSpace methods in
+        a trace: the wall time, the number of rows in and out and the
+        memory delta of the main dataframe for each operation. Starting
+        a trace empties the previous one
+
+        :param enabled: record the calls, defaults to True
+        :type enabled: ``bool`` *optional*
+
+        :example: `ds.trace()`
+        """
+        if enabled is True and self._tracing is False:
+            self._trace = []
+            self._trace_start = time.perf_counter()
+            self._trace_depth = 0
+        self._tracing = enabled
+
+    def trace_(self) -> pd.DataFrame:
+        """
+        Returns the recorded trace. The ``depth`` column is the nesting
+        level of the calls made by other operations, like the lazy plan
+        operations executed by ``collect``
+
+        :return: a dataframe with one row per operation, times in seconds
+            and memory delta in bytes
+        :rtype: ``pd.DataFrame``
+
+        :example: `ds.trace_().sort_values("duration")`
+        """
+        return _trace_(self._trace)
+
+    def export_trace(self, filepath: str, format: str = "json") -> None:
+        """
+        Write the recorded trace to a json file. With the chrome format
+        the file can be opened in chrome://tracing or Perfetto
+
+        :param filepath: path of the file to save
+        :type filepath: ``str``
+        :param format: json or chrome, defaults to "json"
+        :type format: ``str`` *optional*
+
+        :example: `ds.export_trace("trace.json", format="chrome")`
+        """
+        _export_trace(self._trace, filepath, format)
+
     # **************************
     #           info
     # **************************
@@ -64,6 +331,7 @@ class DataSpace:
         """
         return _show(rows, self.df)
 
+    @_cached
     def cols_(self) -> pd.DataFrame:
         """
         Returns a dataframe with columns info
@@ -79,6 +347,7 @@ class DataSpace:
     #           clean
     # **************************
 
+    @_mutating
     def to_date(self, *cols: str, **kwargs) -> None:
         """
         Convert some columns values to date type
@@ -90,8 +359,9 @@ class DataSpace:
 
         :example: `ds.to_date("mycol")`
         """
-        _to_date(self.df, *cols, *kwargs)
+        _to_date(self.df, *cols, **kwargs)
 
+    @_mutating
     def to_int(self, *cols: str, **kwargs) -> None:
         """
         Convert some column values to integers
@@ -103,10 +373,11 @@ class DataSpace:
 
         :example: `ds.to_int("mycol1", "mycol2", errors="coerce")`
         """
-        _to_int(self.df, *cols, *kwargs)
+        _to_int(self.df, *cols, **kwargs)
         if is_notebook is True:
             msg_ok("Converted columns values to integers")
 
+    @_mutating
     def to_float(self, *cols: str, **kwargs) -> None:
         """
         Convert colums values to float
@@ -118,10 +389,11 @@ class DataSpace:
 
         :example: `ds.to_float("mycol1")`
         """
-        _to_float(self.df, *cols, *kwargs)
+        _to_float(self.df, *cols, **kwargs)
         if is_notebook is True:
             msg_ok("Converted columns values to floats")
 
+    @_mutating
     def to_type(self, dtype: type, *cols: str, **kwargs) -> None:
         """
         Convert colums values to a given type in the
@@ -136,10 +408,37 @@ class DataSpace:
 
         :example: ``ds.to_type(str, "mycol")``
         """
-        _to_type(self.df, dtype, *cols, *kwargs)
+        _to_type(self.df, dtype, *cols, **kwargs)
         if is_notebook is True:
-            msg_ok(f"Converted columns values to {dtype}")
+            msg_ok("Converted columns values to", dtype)
+
+    @_mutating
+    def optimize_(self, *cols: str, category_ratio: float = 0.5) -> pd.DataFrame:
+        """
+        Reduce the memory used by columns: integers and floats are
+        downcasted to the smallest type that holds their values without
+        loss and the strings columns with few unique values are converted
+        to categories
+
+        :param cols: names of the columns, defaults to all the columns
+        :type cols: ``str`` *optional*
+        :param category_ratio: maximum ratio of unique values for a strings
+                               column to be converted to categories,
+                               defaults to 0.5
+        :type category_ratio: ``float`` *optional*
+        :return: a dataframe with the types and memory used by the columns
+                 before and after
+        :rtype: ``pd.DataFrame``
+
+        :example: `ds.optimize_()`
+        """
+        report = _optimize_(self.df, *cols, category_ratio=category_ratio)
+        before = report["bytes_before"].sum()
+        after = report["bytes_after"].sum()
+        msg_ok("Columns memory reduced from", before, "to", after, "bytes")
+        return report
 
+    @_mutating
     def drop_nan(self, col: str = None, method: str = "all", **kwargs) -> None:
         """
         Drop rows with ``NaN`` values from the main dataframe
@@ -155,6 +454,7 @@ class DataSpace:
         """
         _drop_nan(self.df, col, method, **kwargs)
 
+    @_mutating
     def fill_nan(self, val: str, *cols):
         """
         Fill NaN values with new values in the main dataframe
@@ -168,6 +468,7 @@ class DataSpace:
         """
         _fill_nan(self.df, val, *cols)
 
+    @_mutating
     def fill_nulls(self, val=nan, *cols: str, nulls=[None, ""]):
         """
         Fill all null values with NaN values in a column.
@@ -180,6 +481,7 @@ class DataSpace:
         """
         _fill_nulls(self.df, val, *cols, nulls=nulls)
 
+    @_mutating
     def index(self, col: str) -> pd.DataFrame:
         """
         Set an index to the main dataframe
@@ -191,6 +493,7 @@ class DataSpace:
         """
         self.df.set_index(self.df[col], inplace=True)
 
+    @_mutating
     def dateindex(self, col: str) -> pd.DataFrame:
         """
         Set a datetime index from a column
@@ -203,6 +506,7 @@ class DataSpace:
         index = pd.DatetimeIndex(self.df[col])
         self.df.set_index(index, inplace=True)
 
+    @_mutating
     def fdate(self, *cols, precision: str = "S", format: str = None):
         """
         Convert column values to formated date string
@@ -218,6 +522,7 @@ class DataSpace:
         """
         _fdate(self.df, *cols, precision=precision, format=format)
 
+    @_mutating
     def timestamps(self, col: str, **kwargs):
         """
         Add a timestamps column from a date column
@@ -231,6 +536,7 @@ class DataSpace:
         """
         _timestamps(self.df, col, **kwargs)
 
+    @_mutating
     def strip(self, *cols: str):
         """
         Remove leading and trailing white spaces column's values
@@ -242,6 +548,7 @@ class DataSpace:
         """
         _strip(self.df, *cols)
 
+    @_mutating
     def strip_cols(self):
         """
         Remove leading and trailing white spaces in columns names
@@ -250,26 +557,28 @@ class DataSpace:
         """
         _strip_cols(self.df)
 
-    def roundvals(self, col: str, precision: int = 2):
+    @_mutating
+    def roundvals(self, col: Union[str, List[str]], precision: int = 2):
         """
-        Round floats in a column. Numbers are going to be
+        Round floats in one or many columns. Numbers are going to be
         converted to floats if they are not already
 
-        :param col: column name
-        :type col: ``str``
+        :param col: column name or list of columns names
+        :type col: ``str`` or ``List[str]``
         :param precision: float precision, defaults to 2
         :param precision: ``int`` *optional*
 
-        :example: `ds.roundvals("mycol")`
+        :example: `ds.roundvals(["mycol1", "mycol2"])`
         """
         _roundvals(self.df, col, precision)
 
-    def replace(self, col: str, searchval: str, replaceval: str):
+    @_mutating
+    def replace(self, col: Union[str, List[str]], searchval: str, replaceval: str):
         """
-        Replace a value in a column in the main dataframe
+        Replace a value in one or many columns in the main dataframe
 
-        :param col: column name
-        :type col: ``str``
+        :param col: column name or list of columns names
+        :type col: ``str`` or ``List[str]``
         :param searchval: value to replace
         :type searchval: ``str``
         :param replaceval: new value
@@ -279,10 +588,36 @@ class DataSpace:
         """
         _replace(self.df, col, searchval, replaceval)
 
+    @_mutating
+    def clean_(self, spec: Dict[str, list]) -> pd.DataFrame:
+        """
+        Apply a cleaning spec to many columns: each column is read and
+        assigned once with all its operations applied. The operations are
+        ``strip``, ``roundvals``, ``replace`` and ``fill_nan``, with their
+        arguments in a tuple
+
+        :param spec: a dict of columns names and lists of operations
+        :type spec: ``Dict[str, list]``
+        :return: the main dataframe
+        :rtype: ``pd.DataFrame``
+
+        :example:
+                        .. code-block:: python
+
+                                ds.clean_({
+                                        "name": ["strip", ("replace", "n/a", "")],
+                                        "price": [("fill_nan", 0), ("roundvals", 2)],
+                                })
+
+        """
+        _clean(self.df, spec)
+        return self.df
+
     # **************************
     #           select
     # **************************
 
+    @_mutating
     def limit(self, r: int = 5) -> None:
         """
         Limit selection to a range in the main dataframe
@@ -292,8 +627,11 @@ class DataSpace:
 
         :example: `ds.limit(100)`
         """
+        # a slice is cheaper than an in place drop, that rebuilds the
+        # blocks anyway: used with both policies
         self.df = self.df[:r]
 
+    @_cached
     def unique_(self, col: str) -> List[str]:
         """
         Returns a list of unique values in a column
@@ -311,6 +649,7 @@ class DataSpace:
         except Exception as e:
             raise Exception("Can not select unique data", e)
 
+    @_cached
     def wunique_(self, col: str, colname: str = "Number") -> pd.DataFrame:
         """
         Weight unique values: returns a dataframe with a count
@@ -324,9 +663,8 @@ class DataSpace:
         :example: `ds.wunique_("col1")`
         """
         try:
-            s = pd.value_counts(self.df[col].values)
-            df = pd.DataFrame(s, columns=[colname])
-            return df
+            s = self.df[col].value_counts().rename_axis(None)
+            return s.to_frame(colname)
         except Exception as e:
             raise Exception("Can not weight unique data", e)
 
@@ -334,6 +672,7 @@ class DataSpace:
     #           count
     # **************************
 
+    @_cached
     def count_null_(self, col: str) -> int:
         """Count the number of null values in a column
 
@@ -346,6 +685,7 @@ class DataSpace:
         """
         return _count_null_(self.df, col)
 
+    @_cached
     def count_empty_(self, col: str) -> int:
         """List of empty row indices
 
@@ -358,6 +698,7 @@ class DataSpace:
         """
         return _count_empty_(self.df, col)
 
+    @_cached
     def count_zero_(self, col: str) -> int:
         """List of row with 0 values
 
@@ -370,6 +711,7 @@ class DataSpace:
         """
         return _count_zero_(self.df, col)
 
+    @_cached
     def count_unique_(self, col: str) -> int:
         """Return the number of unique values in a column
 
@@ -382,10 +724,26 @@ class DataSpace:
         """
         return _count_unique_(self.df, col)
 
+    @_cached
+    def profile_(self, *cols: str) -> pd.DataFrame:
+        """
+        Count the nulls, empty strings, zeros and unique values of
+        columns in a single pass over each column
+
+        :param cols: columns to profile, defaults to all the columns
+        :type cols: str *optional*
+        :return: a dataframe with a row of counts per column
+        :rtype: ``pd.DataFrame``
+
+        :example: `ds.profile_("col1", "col2")`
+        """
+        return _profile_(self.df, *cols)
+
     # **************************
     #        transform
     # **************************
 
+    @_traced
     def split_(self, col: str) -> Dict[str, "DataSpace"]:
         """
         Split the main dataframe according to a column's unique values and
@@ -396,16 +754,29 @@ class DataSpace:
 
         :example: `dss = ds.slit_("Col 1")`
         """
-        dss = {}
-        try:
-            unique = self.df[col].unique()
-            for key in unique:
-                df2 = DataSpace(self.df.loc[self.df[col] == key])
-                dss[key] = df2
-        except Exception as e:
-            raise Exception("Can not split dataframe", e)
-        return dss
+        return {key: DataSpace(df) for key, df in _split(self.df, col).items()}
+
+    @_mutating
+    def map_groups(self, col: str, func, workers: int = None) -> None:
+        """
+        Split the main dataframe according to a column's unique values,
+        run a function over each group in a pool of processes and
+        concatenate the results in the main dataframe
+
+        :param col: column name to group by
+        :type col: ``str``
+        :param func: a function taking and returning a dataframe. It must be
+                     defined at the module level to be sent to the processes
+        :type func: function
+        :param workers: number of processes, defaults to the number of cpus.
+                        With 1 the function runs in the current process
+        :type workers: ``int`` *optional*
 
+        :example: ``ds.map_groups("customer", normalize, workers=8)``
+        """
+        self.df = _map_groups(self.df, col, func, workers)
+
+    @_mutating
     def sort(self, col: str, **kwargs):
         """
         Sorts the main dataframe according to the given column
@@ -416,10 +787,14 @@ class DataSpace:
         :example: `ds.sort("Col 1")`
         """
         try:
-            self.df = self.df.sort_values(col, **kwargs)
+            if self._inplace is True:
+                self.df.sort_values(col, inplace=True, **kwargs)
+            else:
+                self.df = self.df.sort_values(col, **kwargs)
         except Exception as e:
             raise Exception("Can not sort the dataframe from column ", col, e)
 
+    @_mutating
     def indexcol(self, col: str):
         """
         Add a column from the index
@@ -437,6 +812,7 @@ class DataSpace:
         if is_notebook is True:
             msg_ok("Column", col, "added from the index")
 
+    @_mutating
     def drop(self, *cols) -> None:
         """
         Drops columns from the main dataframe
@@ -446,8 +822,9 @@ class DataSpace:
 
         :example: ``ds.drop("Col 1", "Col 2")``
         """
-        self.df = _drop(self.df, *cols)
+        self.df = _drop(self.df, *cols, inplace=self._inplace)
 
+    @_mutating
     def rename(self, source_col: str, dest_col: str) -> None:
         """
         Renames a column in the main dataframe
@@ -459,8 +836,9 @@ class DataSpace:
 
         :example: ``ds.rename("Col 1", "New col")``
         """
-        self.df = _rename(self.df, source_col, dest_col)
+        self.df = _rename(self.df, source_col, dest_col, inplace=self._inplace)
 
+    @_mutating
     def add(self, col: str, value) -> None:
         """
         Add a column with default values
@@ -477,6 +855,7 @@ class DataSpace:
         except Exception as e:
             raise Exception("Can not add column", e)
 
+    @_mutating
     def keep(self, *cols) -> None:
         """
         Limit the dataframe to some columns
@@ -487,11 +866,19 @@ class DataSpace:
         :example: ``ds.keep("Col 1", "Col 2")``
         """
         try:
-            self.df = self.df[list(cols)]
+            if self._inplace is True and list(cols) == [
+                c for c in self.df.columns if c in cols
+            ]:
+                self.df.drop(
+                    [c for c in self.df.columns if c not in cols], axis=1, inplace=True
+                )
+            else:
+                self.df = self.df[list(cols)]
         except Exception as e:
             raise Exception("Can not remove colums", e)
-        msg_ok("Setting dataframe to columns", " ".join(cols))
+        msg_ok("Setting dataframe to columns", _Joined(" ", cols))
 
+    @_mutating
     def exclude(self, col: str, val) -> None:
         """
         Delete rows based on value
@@ -504,10 +891,13 @@ class DataSpace:
         :example: ``ds.exclude("Col 1", "value")``
         """
         try:
+            # a boolean mask is cheaper than an in place drop, that
+            # rebuilds the blocks anyway: used with both policies
             self.df = self.df[self.df[col] != val]
         except Exception as e:
             raise Exception("Can not exclude rows based on value " + str(val), e)
 
+    @_mutating
     def copycol(self, origin_col: str, dest_col: str):
         """
         Copy a columns values in another column
@@ -524,6 +914,7 @@ class DataSpace:
         except Exception as e:
             raise Exception("Can not copy column", e)
 
+    @_mutating
     def dropr(self, *rows):
         """
         Drops some rows from the main dataframe
@@ -531,17 +922,24 @@ class DataSpace:
         :param rows: rows names
         :type rows: list of ints
 
-        :example: ``ds.drop_rows([0, 2])``
+        :example: ``ds.dropr(0, 2)``
         """
         try:
-            self.df = self.df.drop(*rows)
+            if len(rows) == 1 and isinstance(rows[0], list):
+                rows = rows[0]
+            self.df = self.df.drop(index=list(rows))
         except Exception as e:
             raise Exception("Can not drop rows", e)
         msg_ok("Rows dropped")
 
+    @_mutating
     def append(self, vals: list, index=None) -> None:
         """
-        Append a row to the main dataframe
+        Append a row to the main dataframe. The rows are buffered and
+        added to the dataframe in batches of at least ``ds.append_batch``
+        rows, or when the dataframe is read. A batch grows to the size of
+        the dataframe, so that each row is copied a constant number of
+        times on average
 
         :param vals: list of the row values to add
         :type vals: list
@@ -550,8 +948,41 @@ class DataSpace:
 
         :example: ``ds.append([0, 2, 2, 3, 4])``
         """
-        self.df = _append(self.df, vals, index)
+        if self._df is not None and len(vals) != len(self._df.columns):
+            # check now: a bad row would make the whole batch fail later
+            raise Exception(
+                "Can not append row: "
+                + str(len(vals))
+                + " values for "
+                + str(len(self._df.columns))
+                + " columns"
+            )
+        self._rows.append(vals)
+        self._rows_index.append(index)
+        size = self.append_batch
+        if self._df is not None:
+            # each flush copies the dataframe: grow the batches with it
+            size = max(size, len(self._df.index))
+        if len(self._rows) >= size:
+            self.flush()
+
+    @_traced
+    def flush(self) -> None:
+        """
+        Add the buffered rows to the main dataframe
 
+        :example: ``ds.flush()``
+        """
+        if len(self._rows) == 0:
+            return
+        # the buffer is kept if the rows can not be added
+        self._df = _append(self._df, self._rows, self._rows_index)
+        self._rows = []
+        self._rows_index = []
+        self._owned = True
+        self._changed()
+
+    @_mutating
     def reverse(self) -> None:
         """
         Reverses the main dataframe order
@@ -563,6 +994,7 @@ class DataSpace:
         except Exception as e:
             raise Exception("Can not reverse the dataframe", e)
 
+    @_mutating
     def apply(self, function, *cols: List[str], axis=1, **kwargs) -> None:
         """
         Apply a function on columns values
@@ -588,6 +1020,7 @@ class DataSpace:
         """
         self.df = _apply(self.df, function, *cols, axis=axis, **kwargs)
 
+    @_mutating
     def rsum(
         self, time_period: str, num_col: str = "Number", dateindex: str = None
     ) -> None:
@@ -605,6 +1038,7 @@ class DataSpace:
         """
         self.df = _rsum(self.df, time_period, num_col, dateindex)
 
+    @_mutating
     def rmean(self, time_period: str, num_col: str = "Number", dateindex: str = None):
         """
         Resample and add a sum column the main dataframe to a time period
@@ -619,10 +1053,41 @@ class DataSpace:
         """
         self.df = _rmean(self.df, time_period, num_col, dateindex)
 
+    @_traced
+    def resampler_(
+        self, time_period: str, num_col: str = "Number", dateindex: str = None
+    ) -> IncrementalResampler:
+        """
+        Returns an incremental resampler initialized with the main dataframe.
+        New rows are added with ``update``, which only recomputes the time
+        buckets they fall in
+
+        :param time_period: unit + period: periods are Y, M, D, H, Min, S
+        :param time_period: str
+        :param num_col: name of the rows count column, defaults to "Number"
+        :param num_col: str, optional
+        :param dateindex: column name to use as date index, defaults to None
+        :param dateindex: str, optional
+        :return: a resampler with ``update``, ``sum_`` and ``mean_`` methods
+        :rtype: ``IncrementalResampler``
+
+        :example:
+                        .. code-block:: python
+
+                                resampler = ds.resampler_("1Min", dateindex="date")
+                                resampler.update(new_rows_df)
+                                resampler.mean_()
+
+        """
+        resampler = IncrementalResampler(time_period, num_col, dateindex)
+        resampler.update(self.df)
+        return resampler
+
     # **************************
     #        calculations
     # **************************
 
+    @_mutating
     def diffn(self, diffcol: str, name: str = "Diff", doround=True) -> None:
         """
         Add a diff column to the main dataframe: calculate the diff
@@ -639,6 +1104,7 @@ class DataSpace:
             self.df, diffcol=diffcol, name=name, doround=doround, percent=False
         )
 
+    @_mutating
     def diffnp(self, diffcol: str, name: str = "Diff", doround=True) -> None:
         """
         Add a diff column to the main dataframe: calculate the diff
@@ -655,6 +1121,7 @@ class DataSpace:
             self.df, diffcol=diffcol, name=name, doround=doround, percent=True
         )
 
+    @_mutating
     def diffp(self, diffcol: str, name: str = "Diff", doround=True) -> None:
         """
         Add a diff column to the main dataframe: calculate the diff
@@ -671,6 +1138,7 @@ class DataSpace:
             self.df, diffcol=diffcol, name=name, doround=doround, percent=False
         )
 
+    @_mutating
     def diffpp(self, diffcol: str, name: str = "Diff", doround=True) -> None:
         """
         Add a diff column to the main dataframe: calculate the diff
@@ -687,6 +1155,7 @@ class DataSpace:
             self.df, diffcol=diffcol, name=name, doround=doround, percent=True
         )
 
+    @_mutating
     def diffm(
         self, diffcol: str, name: str = "Diff", default=nan, doround=True
     ) -> None:
@@ -707,6 +1176,7 @@ class DataSpace:
             self.df, diffcol, name=name, default=default, doround=doround, percent=False
         )
 
+    @_mutating
     def diffmp(
         self, diffcol: str, name: str = "Diff", default=nan, doround=True
     ) -> None:
@@ -727,9 +1197,9 @@ class DataSpace:
             self.df, diffcol, name=name, default=default, doround=doround, percent=True
         )
 
-    """
+    @_mutating
     def diffs(self, col: str, serie: Iterable, name: str = "Diff") -> None:
-        ""
+        """
         Add a diff column from a serie. The serie is an iterable
         of the same length than the dataframe
 
@@ -741,11 +1211,12 @@ class DataSpace:
         :param name: str, optional
 
         :example: ``ds.diffs("Col 1", [1, 1, 4], "New col")``
-        ""
+        """
         self.df = _diffs(self.df, col, serie, name)
 
+    @_mutating
     def diffsp(self, col: str, serie: Iterable, name: str = "Diff") -> None:
-        ""
+        """
         Add a diff column in percentage from a serie. The serie is
         an iterable of the same length than the dataframe
 
@@ -756,10 +1227,113 @@ class DataSpace:
         :param name: name of the diff col, defaults to "Diff"
         :param name: str, optional
 
-        :example: ``ds.diffp("Col 1", [1, 1, 4], "New col")``
-        ""
+        :example: ``ds.diffsp("Col 1", [1, 1, 4], "New col")``
+        """
         self.df = _diffsp(self.df, col, serie, name)
-    """
+
+    @_cached
+    def rolling_(
+        self, col: str, window: Union[int, str], agg: str = "mean", on: str = None
+    ) -> pd.Series:
+        """
+        Returns a rolling window aggregation of a column. The window is
+        a number of rows or a time offset like "1h" with the ``on`` parameter
+
+        :param col: column to aggregate
+        :type col: ``str``
+        :param window: number of rows or time offset of the window
+        :type window: ``int`` or ``str``
+        :param agg: mean, sum, std, var, min, max, median or count,
+            defaults to "mean"
+        :type agg: ``str`` *optional*
+        :param on: date column for a time offset window, defaults to None
+        :type on: ``str`` *optional*
+        :return: a pandas serie
+        :rtype: ``pd.Series``
+
+        :example: ``ds.add("Mean", ds.rolling_("Col 1", 7))``
+        """
+        vals = _Rolling(col, window, agg, on).apply(self.df)
+        return pd.Series(vals, index=self.df.index, name=col)
+
+    @_cached
+    def ewm_(self, col: str, span: float) -> pd.Series:
+        """
+        Returns the exponentially weighted mean of a column, in its
+        recursive form: the same values as ``df[col].ewm(span=span,
+        adjust=False).mean()``. The pandas default, ``adjust=True``,
+        gives different values for the first rows
+
+        :param col: column to aggregate
+        :type col: ``str``
+        :param span: decay in terms of span
+        :type span: ``float``
+        :return: a pandas serie
+        :rtype: ``pd.Series``
+
+        :example: ``ds.add("Ewm", ds.ewm_("Col 1", 10))``
+        """
+        vals = _Ewm(col, span).apply(self.df)
+        return pd.Series(vals, index=self.df.index, name=col)
+
+    @_cached
+    def zscore_(self, col: str, window: Union[int, str], on: str = None) -> pd.Series:
+        """
+        Returns the moving z-score of a column: the distance of each value
+        to the rolling mean, in rolling standard deviations
+
+        :param col: column to score
+        :type col: ``str``
+        :param window: number of rows or time offset of the window
+        :type window: ``int`` or ``str``
+        :param on: date column for a time offset window, defaults to None
+        :type on: ``str`` *optional*
+        :return: a pandas serie
+        :rtype: ``pd.Series``
+
+        :example: ``outliers = ds.df[ds.zscore_("Col 1", 30).abs() > 3]``
+        """
+        vals = _ZScore(col, window, on).apply(self.df)
+        return pd.Series(vals, index=self.df.index, name=col)
+
+    @_cached
+    def lreg_(self, x: str, y: str, by: str = None) -> pd.DataFrame:
+        """
+        Returns the linear regression coefficients of a column over
+        another: slope, intercept, r2 and count of points. With ``by`` the
+        regression is computed for each group of a column, all at once
+
+        :param x: name of the explanatory column
+        :type x: ``str``
+        :param y: name of the explained column
+        :type y: ``str``
+        :param by: column to group by, defaults to None
+        :type by: ``str`` *optional*
+        :return: a pandas dataframe with a row per group
+        :rtype: ``pd.DataFrame``
+
+        :example: ``ds.lreg_("Col 1", "Col 2", by="Col 3")``
+        """
+        return _lreg_(self.df, x, y, by)
+
+    @_mutating
+    def lreg(self, x: str, y: str, by: str = None, name: str = "Regression") -> None:
+        """
+        Add a column with the values fitted by a linear regression of
+        a column over another
+
+        :param x: name of the explanatory column
+        :type x: ``str``
+        :param y: name of the explained column
+        :type y: ``str``
+        :param by: column to group by, defaults to None
+        :type by: ``str`` *optional*
+        :param name: name of the new column, defaults to "Regression"
+        :type name: ``str`` *optional*
+
+        :example: ``ds.lreg("Col 1", "Col 2", name="Fitted")``
+        """
+        self.df = _lreg(self.df, x, y, by, name)
 
     # **************************
     #           charts
@@ -800,6 +1374,7 @@ class DataSpace:
             self._chartEngine = DsChart()
         return self._chartEngine.set_axis(x_axis_col, y_axis_col)
 
+    @_traced
     def line_(self, **kwargs):
         """
         Draw a line chart
@@ -810,6 +1385,7 @@ class DataSpace:
         """
         return self._chartEngine.chart(self.df, "line", **kwargs)
 
+    @_traced
     def point_(self, **kwargs):
         """
         Draw a point chart
@@ -820,6 +1396,7 @@ class DataSpace:
         """
         return self._chartEngine.chart(self.df, "point", **kwargs)
 
+    @_traced
     def bar_(self, **kwargs):
         """
         Draw a bar chart
@@ -830,6 +1407,7 @@ class DataSpace:
         """
         return self._chartEngine.chart(self.df, "bar", **kwargs)
 
+    @_traced
     def bar_num_(self, **kwargs):
         """
         Draw a bar chart with numbers. Only for Altair
@@ -846,6 +1424,7 @@ class DataSpace:
             )
         return self._chartEngine.chart(self.df, "bar_num", **kwargs)
 
+    @_traced
     def area_(self, **kwargs):
         """
         Draw an area chart
@@ -856,6 +1435,7 @@ class DataSpace:
         """
         return self._chartEngine.chart(self.df, "area", **kwargs)
 
+    @_traced
     def hline_(self, **kwargs):
         """
         Draw an horizontal mean line for the y axis
@@ -866,18 +1446,122 @@ class DataSpace:
         """
         return self._chartEngine.chart(self.df, "hline", **kwargs)
 
+    @_traced
+    def lreg_chart_(self, by: str = None, **kwargs):
+        """
+        Draw a point chart with a linear regression line overlay. With
+        ``by`` a regression line is drawn for each group of a column
+
+        :param by: column to group by, defaults to None
+        :type by: ``str`` *optional*
+        :rtype: Bokeh or Altair chart
+
+        :example: `ds.lreg_chart_()`
+        """
+        return self._chartEngine.chart(self.df, "lreg", by=by, **kwargs)
+
     # **************************
     #           export
     # **************************
 
-    def export_csv(self, filepath: str, **kwargs) -> None:
+    @_traced
+    def export_csv(
+        self,
+        filepath: str,
+        compression: Union[str, dict] = "infer",
+        parts: int = None,
+        workers: int = None,
+        **kwargs,
+    ) -> None:
+        """
+        Write the main dataframe to a csv file. The rows are written and
+        compressed by chunks of ``chunksize`` rows. With ``parts`` the
+        rows are split in many files written in parallel, the part number
+        is added to the file name: ``data.csv.gz`` gives ``data-0.csv.gz``,
+        ``data-1.csv.gz``...
+
+        :param filepath: path of the file to save
+        :type filepath: ``str``
+        :param compression: gzip, zstd, bz2, xz, a dict like ``{"method":
+            "gzip", "compresslevel": 1}`` or None, defaults to "infer" from
+            the file extension
+        :type compression: ``str`` or ``dict`` *optional*
+        :param parts: number of files to write, defaults to None (one file)
+        :type parts: ``int`` *optional*
+        :param workers: number of processes writing the parts, defaults
+            to None (number of cpus)
+        :type workers: ``int`` *optional*
+        :param \*\*kwargs: arguments to pass to ``pd.to_csv``, like
+            ``chunksize``
+
+        :example: `ds.export_csv("myfile.csv.gz", parts=8, header=False)`
+        """
+        if parts is not None and parts > 1:
+            _export_csv_parts(
+                self.df, filepath, parts, workers, compression=compression, **kwargs
+            )
+            return
+        return _export_csv(self.df, filepath, compression=compression, **kwargs)
+
+    @_traced
+    def export_parquet(self, filepath: str, **kwargs) -> None:
         """
-        Write the main dataframe to a csv file
+        Write the main dataframe to a parquet file
 
         :param filepath: path of the file to save
         :type filepath: ``str``
-        :param \*\*kwargs: arguments to pass to ``pd.to_csv``
+        :param \*\*kwargs: arguments to pass to ``pd.to_parquet``
 
-        :example: `ds.export_csv("myfile.csv", header=false)`
+        :example: `ds.export_parquet("myfile.parquet", row_group_size=100000)`
         """
-        return _export_csv(self.df, filepath, **kwargs)
+        return _export_parquet(self.df, filepath, **kwargs)
+
+    @_traced
+    def export_feather(self, filepath: str, **kwargs) -> None:
+        """
+        Write the main dataframe to a feather (Arrow IPC) file
+
+        :param filepath: path of the file to save
+        :type filepath: ``str``
+        :param \*\*kwargs: arguments to pass to ``pd.to_feather``
+
+        :example: `ds.export_feather("myfile.feather")`
+        """
+        return _export_feather(self.df, filepath, **kwargs)
+
+    @_traced
+    def export_sql(
+        self,
+        table: str,
+        engine,
+        if_exists: str = "append",
+        method: str = None,
+        batch_size: int = 10000,
+        **kwargs,
+    ) -> None:
+        """
+        Write the main dataframe to a sql table in batches of rows. The
+        engines created from a database url are kept to reuse the
+        connections of their pool
+
+        :param table: name of the table
+        :type table: ``str``
+        :param engine: SQLAlchemy engine, database url or DBAPI connection
+        :type engine: ``sqlalchemy.engine.Engine`` or ``str``
+        :param if_exists: fail, replace or append, defaults to "append"
+        :type if_exists: ``str`` *optional*
+        :param method: insert method: None for the driver executemany,
+            batched in multi rows inserts by SQLAlchemy 2, "multi" for a
+            multi rows insert statement built by pandas per batch or "copy"
+            for the PostgreSQL COPY command with the psycopg2 or psycopg 3
+            driver, defaults to None
+        :type method: ``str`` *optional*
+        :param batch_size: number of rows per insert, defaults to 10000
+        :type batch_size: ``int`` *optional*
+        :param \*\*kwargs: arguments to pass to ``pd.to_sql``
+
+        :example: `ds.export_sql("sales", "sqlite:///db.sqlite", index=False)`
+        """
+        return _export_sql(
+            self.df, table, engine, if_exists, method, batch_size, **kwargs
+        )
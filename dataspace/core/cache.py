@@ -0,0 +1,58 @@
+import copy
+from functools import wraps
+
+from dataspace.core.trace import _span
+
+
+def _cached(func):
+    """
+    Decorate the read only DataSpace methods: the results are memoized
+    for the current version of the main dataframe, with a least recently
+    used eviction
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with _span(self, func.__name__):
+            return _cached_call(self, func, args, kwargs)
+
+    return wrapper
+
+
+def _frame_key(df) -> tuple:
+    """
+    Identify the main dataframe, to not return stale results after a
+    direct change of ``ds.df`` like ``ds.df["col"] = values``
+    """
+    if df is None:
+        return None
+    return (id(df), df.shape, hash(tuple(df.columns)))
+
+
+def _cached_call(ds, func, args, kwargs):
+    """
+    Get the result of a read only method from the cache, or run it
+    """
+    # run the pending operations before reading the frame version
+    df = ds.df
+    key = (
+        ds._version,
+        _frame_key(df),
+        func.__name__,
+        args,
+        tuple(sorted(kwargs.items())),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return func(ds, *args, **kwargs)
+    if key in ds._cache:
+        ds._cache.move_to_end(key)
+        ds._cache_hits += 1
+        return copy.copy(ds._cache[key])
+    ds._cache_misses += 1
+    res = func(ds, *args, **kwargs)
+    ds._cache[key] = res
+    while len(ds._cache) > ds.cache_size:
+        ds._cache.popitem(last=False)
+    return copy.copy(res)
@@ -0,0 +1,349 @@
+from typing import Callable, Iterator, List, Tuple, Union
+
+from numpy import nan
+import pandas as pd
+
+from dataspace.calculations import _Rolling, _ZScore, _Ewm
+from dataspace.core import DataSpace
+from dataspace.core.plan import Operation
+from dataspace.io.export import _export_csv_chunks
+
+
+class ChunkedDataSpace:
+    """
+    A dataspace processed chunk by chunk. The row wise operations are
+    recorded and applied to each chunk when the data is consumed, so that
+    only one chunk is held in memory at a time
+    """
+
+    _reader: Callable[[], Iterator[pd.DataFrame]] = None
+    _plan: List[Operation] = None
+    _windows: List[Tuple[str, Callable, tuple]] = None
+
+    def __init__(self, reader: Callable[[], Iterator[pd.DataFrame]]) -> None:
+        self._reader = reader
+        self._plan = []
+        self._windows = []
+
+    def __repr__(self) -> str:
+        return (
+            "<ChunkedDataSpace object | "
+            + str(len(self._plan))
+            + " operations per chunk>"
+        )
+
+    def _record(self, name: str, *args, **kwargs) -> None:
+        self._plan.append((name, args, kwargs))
+
+    # **************************
+    #           clean
+    # **************************
+
+    def to_date(self, *cols: str, **kwargs) -> None:
+        """
+        Convert some columns values to date type in each chunk
+
+        :param cols: names of the colums
+        :type cols: ``str`` *at least one*
+        :param \*\*kwargs: keyword arguments for ``pd.to_datetime``
+        :type \*\*kwargs: optional
+
+        :example: `ds.to_date("mycol")`
+        """
+        self._record("to_date", *cols, **kwargs)
+
+    def to_int(self, *cols: str, **kwargs) -> None:
+        """
+        Convert some column values to integers in each chunk
+
+        :param \*cols: names of the columns
+        :type \*cols: ``str`` *at least one*
+        :param \*\*kwargs: keyword arguments for ``pd.to_numeric``
+        :type \*\*kwargs: optional
+
+        :example: `ds.to_int("mycol1", "mycol2", errors="coerce")`
+        """
+        self._record("to_int", *cols, **kwargs)
+
+    def to_float(self, *cols: str, **kwargs) -> None:
+        """
+        Convert colums values to float in each chunk
+
+        :param cols: name of the columns
+        :type cols: ``str`` *at least one*
+        :param \*\*kwargs: keyword arguments for ``df.astype``
+        :type \*\*kwargs: optional
+
+        :example: `ds.to_float("mycol1")`
+        """
+        self._record("to_float", *cols, **kwargs)
+
+    def fill_nan(self, val: str, *cols) -> None:
+        """
+        Fill NaN values with new values in each chunk
+
+        :param val: new value
+        :type val: ``str``
+        :param \*cols: names of the colums
+        :type \*cols: ``str`` *at least one*
+
+        :example: ``ds.fill_nan("new value", "mycol1", "mycol2")``
+        """
+        self._record("fill_nan", val, *cols)
+
+    def fill_nulls(self, val=nan, *cols: str, nulls=[None, ""]) -> None:
+        """
+        Fill all null values with NaN values in a column in each chunk.
+        Null values are ``None`` or en empty string
+
+        :param cols: columns names
+        :type cols: ``str`` *at least one*
+
+        :example: `ds.fill_nulls("mycol")`
+        """
+        self._record("fill_nulls", val, *cols, nulls=nulls)
+
+    def fdate(self, *cols, precision: str = "S", format: str = None) -> None:
+        """
+        Convert column values to formated date string in each chunk
+
+        :param \*cols: names of the colums
+        :type \*cols: str, at least one
+        :param precision: time precision: Y, M, D, H, Min S, defaults to "S"
+        :type precision: ``str`` *optional*
+        :param format: python date format, defaults to None
+        :type format: str, optional
+
+        :example: `ds.fdate("mycol1", "mycol2", precision="D")`
+        """
+        self._record("fdate", *cols, precision=precision, format=format)
+
+    def strip(self, *cols: str) -> None:
+        """
+        Remove leading and trailing white spaces column's values
+        in each chunk
+
+        :param col: name of the column
+        :type col: ``str``
+
+        :example: `ds.strip("mycol")`
+        """
+        self._record("strip", *cols)
+
+    def roundvals(self, col: Union[str, List[str]], precision: int = 2) -> None:
+        """
+        Round floats in one or many columns in each chunk
+
+        :param col: column name or list of columns names
+        :type col: ``str`` or ``List[str]``
+        :param precision: float precision, defaults to 2
+        :param precision: ``int`` *optional*
+
+        :example: `ds.roundvals("mycol")`
+        """
+        self._record("roundvals", col, precision)
+
+    def replace(
+        self, col: Union[str, List[str]], searchval: str, replaceval: str
+    ) -> None:
+        """
+        Replace a value in one or many columns in each chunk
+
+        :param col: column name or list of columns names
+        :type col: ``str`` or ``List[str]``
+        :param searchval: value to replace
+        :type searchval: ``str``
+        :param replaceval: new value
+        :type replaceval: ``str``
+
+        :example: `ds.replace("mycol", "value", "new_value")`
+        """
+        self._record("replace", col, searchval, replaceval)
+
+    # **************************
+    #        transform
+    # **************************
+
+    def drop(self, *cols) -> None:
+        """
+        Drops columns from each chunk
+
+        :param cols: names of the columns
+        :type cols: str
+
+        :example: ``ds.drop("Col 1", "Col 2")``
+        """
+        self._record("drop", *cols)
+
+    def rename(self, source_col: str, dest_col: str) -> None:
+        """
+        Renames a column in each chunk
+
+        :param source_col: name of the column to rename
+        :type source_col: str
+        :param dest_col: new name of the column
+        :type dest_col: str
+
+        :example: ``ds.rename("Col 1", "New col")``
+        """
+        self._record("rename", source_col, dest_col)
+
+    def keep(self, *cols) -> None:
+        """
+        Limit each chunk to some columns
+
+        :param cols: names of the columns
+        :type cols: str
+
+        :example: ``ds.keep("Col 1", "Col 2")``
+        """
+        self._record("keep", *cols)
+
+    def exclude(self, col: str, val) -> None:
+        """
+        Delete rows based on value in each chunk
+
+        :param col: column name
+        :type col: str
+        :param val: value to delete
+        :type val: any
+
+        :example: ``ds.exclude("Col 1", "value")``
+        """
+        self._record("exclude", col, val)
+
+    # **************************
+    #        calculations
+    # **************************
+
+    def rolling(
+        self,
+        col: str,
+        window: Union[int, str],
+        agg: str = "mean",
+        name: str = "Rolling",
+        on: str = None,
+    ) -> None:
+        """
+        Add a rolling window aggregation column to each chunk. The rows
+        of the previous chunk still in the window are carried over, and
+        the column is computed after the other chunk operations
+
+        :param col: column to aggregate
+        :type col: ``str``
+        :param window: number of rows or time offset of the window
+        :type window: ``int`` or ``str``
+        :param agg: mean, sum, std, var, min, max, median or count,
+            defaults to "mean"
+        :type agg: ``str`` *optional*
+        :param name: name of the new column, defaults to "Rolling"
+        :type name: ``str`` *optional*
+        :param on: date column for a time offset window, defaults to None
+        :type on: ``str`` *optional*
+
+        :example: ``ds.rolling("Col 1", "1h", name="Mean", on="Date")``
+        """
+        self._windows.append((name, _Rolling, (col, window, agg, on)))
+
+    def ewm(self, col: str, span: float, name: str = "Ewm") -> None:
+        """
+        Add an exponentially weighted mean column to each chunk. The
+        column is computed after the other chunk operations, in the
+        recursive form of ``ewm(span=span, adjust=False)``, and not with
+        the pandas default ``adjust=True``
+
+        :param col: column to aggregate
+        :type col: ``str``
+        :param span: decay in terms of span
+        :type span: ``float``
+        :param name: name of the new column, defaults to "Ewm"
+        :type name: ``str`` *optional*
+
+        :example: ``ds.ewm("Col 1", 10)``
+        """
+        self._windows.append((name, _Ewm, (col, span)))
+
+    def zscore(
+        self,
+        col: str,
+        window: Union[int, str],
+        name: str = "Zscore",
+        on: str = None,
+    ) -> None:
+        """
+        Add a moving z-score column to each chunk. The column is computed
+        after the other chunk operations
+
+        :param col: column to score
+        :type col: ``str``
+        :param window: number of rows or time offset of the window
+        :type window: ``int`` or ``str``
+        :param name: name of the new column, defaults to "Zscore"
+        :type name: ``str`` *optional*
+        :param on: date column for a time offset window, defaults to None
+        :type on: ``str`` *optional*
+
+        :example: ``ds.zscore("Col 1", 30)``
+        """
+        self._windows.append((name, _ZScore, (col, window, on)))
+
+    # **************************
+    #          output
+    # **************************
+
+    def chunks_(self) -> Iterator[DataSpace]:
+        """
+        Iterate over the chunks with the recorded operations applied
+
+        :return: an iterator of DataSpace instances
+        :rtype: ``Iterator[DataSpace]``
+
+        :example: ``for chunk in ds.chunks_(): chunk.show()``
+        """
+        windows = [(name, cls(*args)) for name, cls, args in self._windows]
+        for df in self._reader():
+            ds = DataSpace(df)
+            ds.lazy()
+            ds._plan = list(self._plan)
+            ds.collect()
+            for name, window in windows:
+                ds.add(name, window.apply(ds.df))
+            yield ds
+
+    def collect_(self) -> DataSpace:
+        """
+        Process all the chunks and concatenate them in a DataSpace. The
+        processed data must fit in memory
+
+        :return: a DataSpace
+        :rtype: ``DataSpace``
+
+        :example: ``ds2 = ds.collect_()``
+        """
+        dfs = [ds.df for ds in self.chunks_()]
+        if len(dfs) == 0:
+            return DataSpace(pd.DataFrame())
+        return DataSpace(pd.concat(dfs))
+
+    def export_csv(
+        self, filepath: str, compression: Union[str, dict] = "infer", **kwargs
+    ) -> None:
+        """
+        Process the chunks and write them one by one to a csv file
+
+        :param filepath: path of the file to save
+        :type filepath: ``str``
+        :param compression: gzip, zstd, bz2, xz, a dict like ``{"method":
+            "gzip", "compresslevel": 1}`` or None, defaults to "infer" from
+            the file extension
+        :type compression: ``str`` or ``dict`` *optional*
+        :param \*\*kwargs: arguments to pass to ``pd.to_csv``
+
+        :example: `ds.export_csv("myfile.csv.gz")`
+        """
+        _export_csv_chunks(
+            (ds.df for ds in self.chunks_()),
+            filepath,
+            compression=compression,
+            **kwargs,
+        )
@@ -1,17 +1,18 @@
-try:
-    from IPython import get_ipython
-except:
-    pass
+import sys
 
 
 def _is_notebook():
+    # IPython is already loaded when running in a notebook: do not
+    # import it otherwise, as it is slow to import
+    if "IPython" not in sys.modules:
+        return False
     try:
-        shell = get_ipython().__class__.__name__
+        shell = sys.modules["IPython"].get_ipython().__class__.__name__
         if shell == "ZMQInteractiveShell":
             return True
         else:
             return False
-    except NameError:
+    except (NameError, AttributeError):
         return False
 
 
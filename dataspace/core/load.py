@@ -1,26 +1,302 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
 import pandas as pd
 
 from dataspace.utils.messages import msg_start, msg_end, msg_warning
+from dataspace.io.sql import _sql_engine
+from dataspace.io.diskcache import _cached_load
 from . import DataSpace
+from .chunked import ChunkedDataSpace
 
 
 def _load_csv(url, **kwargs) -> pd.DataFrame:
     msg_start("Loading csv...")
     try:
-        return pd.read_csv(url, **kwargs)
+        df = pd.read_csv(url, **kwargs)
     except FileNotFoundError:
-        msg = "File " + url + " not found"
-        msg_warning(msg)
+        msg_warning("File", url, "not found")
         return
     except Exception as e:
         raise Exception("Can not load csv file", e)
     msg_end("Finished loading csv")
+    return df
+
+
+def _load_csv_chunks(url, chunksize: int, **kwargs) -> Iterator[pd.DataFrame]:
+    try:
+        reader = pd.read_csv(url, chunksize=chunksize, **kwargs)
+    except Exception as e:
+        raise Exception("Can not load csv file", e)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def _is_many(url) -> bool:
+    """
+    Check if a csv url is a list of paths or a glob pattern. Urls and
+    existing files with ``?`` or ``[`` in their name are not patterns
+    """
+    if isinstance(url, (list, tuple)):
+        return True
+    if not isinstance(url, str) or "://" in url or os.path.exists(url):
+        return False
+    return any(c in url for c in "*?[")
+
+
+def _csv_files(url) -> List[str]:
+    if isinstance(url, (list, tuple)):
+        files = list(url)
+    else:
+        files = sorted(glob.glob(url))
+    # a file is loaded once
+    return list(dict.fromkeys(files))
+
+
+def _read_csv_file(path: str, kwargs: dict) -> pd.DataFrame:
+    return pd.read_csv(path, **kwargs)
+
+
+def _source_values(dfs: List[pd.DataFrame], files: List[str]) -> pd.Categorical:
+    """
+    Get the source file of each row, as categories
+    """
+    lengths = [len(df.index) for df in dfs]
+    codes = np.repeat(np.arange(len(files)), lengths)
+    return pd.Categorical.from_codes(codes, categories=files)
+
+
+def _load_csvs(
+    files: List[str], workers: int = None, source_col: str = None, **kwargs
+) -> pd.DataFrame:
+    msg_start("Loading", len(files), "csv files...")
+    try:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(files) <= 1:
+            dfs = [_read_csv_file(path, kwargs) for path in files]
+        else:
+            workers = min(workers, len(files))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                dfs = list(executor.map(_read_csv_file, files, [kwargs] * len(files)))
+        # the columns missing from some files are filled with NaN and
+        # the columns types are upcasted to a common type
+        df = pd.concat(dfs, ignore_index=True, sort=False)
+        if source_col is not None:
+            df[source_col] = _source_values(dfs, files)
+    except Exception as e:
+        raise Exception("Can not load csv files", e)
+    msg_end("Finished loading", len(files), "csv files")
+    return df
+
+
+def _load_csvs_chunks(
+    files: List[str], chunksize: int, source_col: str = None, **kwargs
+) -> Iterator[pd.DataFrame]:
+    try:
+        # read the headers first to give the same columns to all the chunks
+        header_kwargs = dict(kwargs, nrows=0)
+        cols = []
+        for path in files:
+            for col in pd.read_csv(path, **header_kwargs).columns:
+                if col not in cols:
+                    cols.append(col)
+    except Exception as e:
+        raise Exception("Can not load csv files", e)
+    for path in files:
+        for chunk in _load_csv_chunks(path, chunksize, **kwargs):
+            chunk = chunk.reindex(columns=cols)
+            if source_col is not None:
+                chunk[source_col] = path
+            yield chunk
+
+
+def _load_parquet(url, columns: List[str] = None, filters=None, **kwargs):
+    msg_start("Loading parquet...")
+    try:
+        df = pd.read_parquet(url, columns=columns, filters=filters, **kwargs)
+    except FileNotFoundError:
+        msg_warning("File", url, "not found")
+        return
+    except ImportError as e:
+        raise Exception("Please install pyarrow to load parquet files", e)
+    except Exception as e:
+        raise Exception("Can not load parquet file", e)
+    msg_end("Finished loading parquet")
+    return df
+
+
+def _load_arrow(source, columns: List[str] = None, filters=None) -> pd.DataFrame:
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise Exception("Please install pyarrow to load arrow data", e)
+    try:
+        if isinstance(source, pa.Table):
+            table = source
+            # filter first: the filters can use columns that are not selected
+            if filters is not None:
+                table = table.filter(pq.filters_to_expression(filters))
+            if columns is not None:
+                table = table.select(columns)
+        else:
+            msg_start("Loading arrow file...")
+            expression = None
+            if filters is not None:
+                expression = pq.filters_to_expression(filters)
+            dataset = ds.dataset(source, format="ipc")
+            table = dataset.to_table(columns=columns, filter=expression)
+            msg_end("Finished loading arrow file")
+        return table.to_pandas()
+    except FileNotFoundError:
+        msg_warning("File", source, "not found")
+        return
+    except Exception as e:
+        raise Exception("Can not load arrow data", e)
+
+
+def _load_sql(query, engine, params=None, **kwargs) -> pd.DataFrame:
+    msg_start("Loading sql query...")
+    try:
+        df = pd.read_sql(query, _sql_engine(engine), params=params, **kwargs)
+    except Exception as e:
+        raise Exception("Can not load sql query", e)
+    msg_end("Finished loading sql query")
+    return df
+
+
+def _load_sql_chunks(
+    query, engine, chunksize: int, params=None, **kwargs
+) -> Iterator[pd.DataFrame]:
+    engine = _sql_engine(engine)
+    if hasattr(engine, "connect"):
+        # a SQLAlchemy engine: stream the rows with a server side cursor
+        # on a connection from the pool
+        with engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            yield from _read_sql_chunks(query, conn, chunksize, params, **kwargs)
+    else:
+        yield from _read_sql_chunks(query, engine, chunksize, params, **kwargs)
 
 
-def _load_django(query) -> pd.DataFrame:
+def _read_sql_chunks(
+    query, conn, chunksize: int, params=None, **kwargs
+) -> Iterator[pd.DataFrame]:
     try:
-        df = pd.DataFrame(list(query.values()))
-        return df
+        reader = pd.read_sql(query, conn, params=params, chunksize=chunksize, **kwargs)
+    except Exception as e:
+        raise Exception("Can not load sql query", e)
+    for chunk in reader:
+        yield chunk
+
+
+# rows fetched from the database at a time when loading a Django query
+DJANGO_BATCH = 10000
+
+INT_FIELDS = (
+    "AutoField",
+    "BigAutoField",
+    "SmallAutoField",
+    "IntegerField",
+    "BigIntegerField",
+    "SmallIntegerField",
+    "PositiveIntegerField",
+    "PositiveBigIntegerField",
+    "PositiveSmallIntegerField",
+)
+
+
+def _django_columns(query, columns: List[str] = None) -> List[str]:
+    if columns is not None:
+        return list(columns)
+    # the same columns as query.values(): the foreign keys are ids
+    return [field.attname for field in query.model._meta.concrete_fields]
+
+
+def _django_dtypes(query, columns: List[str]) -> Dict[str, str]:
+    """
+    Get the dtypes of the columns from the model fields. The columns
+    that are not model fields, like lookups, have their type inferred
+    """
+    dtypes = {}
+    for col in columns:
+        try:
+            field = query.model._meta.get_field(col)
+        except Exception:
+            continue
+        null = field.null
+        if field.many_to_one is True:
+            # foreign key: the type of the related field
+            field = field.target_field
+        kind = field.get_internal_type()
+        if kind in INT_FIELDS:
+            dtypes[col] = "Int64" if null is True else "int64"
+        elif kind == "FloatField":
+            dtypes[col] = "float64"
+        elif kind == "BooleanField":
+            dtypes[col] = "boolean" if null is True else "bool"
+        elif kind == "DateTimeField":
+            dtypes[col] = "datetime"
+    return dtypes
+
+
+def _django_frame(
+    rows: List[tuple], columns: List[str], dtypes: Dict[str, str]
+) -> pd.DataFrame:
+    """
+    Build a dataframe from the rows tuples, one typed array per column
+    """
+    if len(rows) == 0:
+        values = [[]] * len(columns)
+    else:
+        values = zip(*rows)
+    data = {}
+    for col, vals in zip(columns, values):
+        dtype = dtypes.get(col)
+        if dtype is None:
+            data[col] = pd.Series(vals, dtype=object if len(rows) == 0 else None)
+        elif dtype == "datetime":
+            data[col] = pd.to_datetime(list(vals))
+        elif dtype in ("int64", "float64", "bool"):
+            data[col] = np.fromiter(vals, dtype=dtype, count=len(rows))
+        else:
+            data[col] = pd.array(vals, dtype=dtype)
+    return pd.DataFrame(data, columns=columns)
+
+
+def _load_django_chunks(
+    query, columns: List[str] = None, chunksize: int = DJANGO_BATCH
+) -> Iterator[pd.DataFrame]:
+    try:
+        columns = _django_columns(query, columns)
+        dtypes = _django_dtypes(query, columns)
+        rows = query.values_list(*columns).iterator(chunk_size=chunksize)
+    except Exception as e:
+        raise Exception("Can not create dataspace from query", e)
+    while True:
+        try:
+            batch = list(islice(rows, chunksize))
+        except Exception as e:
+            raise Exception("Can not create dataspace from query", e)
+        if len(batch) == 0:
+            break
+        yield _django_frame(batch, columns, dtypes)
+
+
+def _load_django(query, columns: List[str] = None) -> pd.DataFrame:
+    try:
+        dfs = list(_load_django_chunks(query, columns))
+        if len(dfs) == 0:
+            cols = _django_columns(query, columns)
+            return _django_frame([], cols, _django_dtypes(query, cols))
+        return pd.concat(dfs, ignore_index=True)
     except Exception as e:
         raise Exception("Can not create dataspace from query", e)
 
@@ -38,34 +314,163 @@ def from_df(df: pd.DataFrame) -> DataSpace:
     return DataSpace(df)
 
 
-def from_csv(url, **kwargs) -> DataSpace:
+def from_csv(
+    url,
+    chunksize: int = None,
+    workers: int = None,
+    source_col: str = None,
+    cache: bool = False,
+    **kwargs,
+) -> Union[DataSpace, ChunkedDataSpace]:
     """
-    Loads csv data in the main dataframe
+    Loads csv data in the main dataframe. Many files can be loaded at once
+    with a glob pattern or a list of paths: they are parsed in a pool of
+    processes and concatenated, with the columns of all the files
 
     :param url: url of the csv file to load:
                             can be absolute if it starts with ``/``
-                            or relative if it starts with ``./``
-    :type url: ``str``
+                            or relative if it starts with ``./``,
+                            a glob pattern or a list of paths
+    :type url: ``str`` or ``List[str]``
+    :param chunksize: number of rows per chunk: if set the file is
+                      streamed and processed chunk by chunk, defaults to None
+    :type chunksize: ``int`` *optional*
+    :param workers: number of processes to parse many files, defaults
+                    to None (number of cpus)
+    :type workers: ``int`` *optional*
+    :param source_col: name of a column to add with the file of each row
+                       when loading many files, defaults to None
+    :type source_col: ``str`` *optional*
+    :param cache: store the parsed data in an on disk cache, reused while
+                  the files and arguments are the same, defaults to False.
+                  Not used when an argument is a function
+    :type cache: ``bool`` *optional*
     :param kwargs: keyword arguments to pass to Pandas
                                 ``read_csv`` function
+    :return: a DataSpace, or a ChunkedDataSpace if a chunksize is set
+    :rtype: ``DataSpace`` or ``ChunkedDataSpace``
+
+    :example: `dataspace.from_csv("./data/*.csv", workers=4, source_col="file")`
+    """
+    if cache is True and chunksize is not None:
+        msg_warning("The cache is not used for the chunked data")
+    if _is_many(url):
+        files = _csv_files(url)
+        if len(files) == 0:
+            msg_warning("No file found for", url)
+            return DataSpace()
+        if chunksize is not None:
+            return ChunkedDataSpace(
+                lambda: _load_csvs_chunks(files, chunksize, source_col, **kwargs)
+            )
+        if cache is True:
+            key = dict(kwargs, source_col=source_col)
+            return DataSpace(
+                _cached_load(
+                    files,
+                    key,
+                    lambda: _load_csvs(files, workers, source_col, **kwargs),
+                )
+            )
+        return DataSpace(_load_csvs(files, workers, source_col, **kwargs))
+    if chunksize is not None:
+        return ChunkedDataSpace(lambda: _load_csv_chunks(url, chunksize, **kwargs))
+    if cache is True:
+        return DataSpace(_cached_load([url], kwargs, lambda: _load_csv(url, **kwargs)))
+    return DataSpace(_load_csv(url, **kwargs))
+
+
+def from_parquet(url, columns: List[str] = None, filters=None, **kwargs) -> DataSpace:
+    """
+    Loads parquet data in the main dataframe. Only the requested columns
+    are read and the row groups that do not match the filters are skipped
+
+    :param url: path of the parquet file or directory to load
+    :type url: ``str``
+    :param columns: names of the columns to load, defaults to None (all)
+    :type columns: ``List[str]`` *optional*
+    :param filters: row filters like ``[("col", ">", 0)]``, defaults to None
+    :type filters: ``List[Tuple]`` *optional*
+    :param kwargs: keyword arguments to pass to Pandas
+                                ``read_parquet`` function
     :return: a DataSpace
     :rtype: ``DataSpace``
 
-    :example: `dataspace.from_csv("./myfile.csv")`
+    :example: `dataspace.from_parquet("./myfile.parquet", columns=["col1"])`
     """
-    return DataSpace(_load_csv(url, **kwargs))
+    return DataSpace(_load_parquet(url, columns, filters, **kwargs))
 
 
-def from_django(query) -> DataSpace:
+def from_arrow(source, columns: List[str] = None, filters=None) -> DataSpace:
     """
-    Load the main dataframe from a django orm query
+    Loads Arrow data in the main dataframe from a ``pyarrow.Table`` or
+    an Arrow IPC (feather) file
+
+    :param source: an Arrow table or the path of the file to load
+    :type source: ``pyarrow.Table`` or ``str``
+    :param columns: names of the columns to load, defaults to None (all)
+    :type columns: ``List[str]`` *optional*
+    :param filters: row filters like ``[("col", ">", 0)]``, defaults to None
+    :type filters: ``List[Tuple]`` *optional*
+    :return: a DataSpace
+    :rtype: ``DataSpace``
+
+    :example: `dataspace.from_arrow("./myfile.feather")`
+    """
+    return DataSpace(_load_arrow(source, columns, filters))
+
+
+def from_sql(
+    query, engine, chunksize: int = None, params=None, **kwargs
+) -> Union[DataSpace, ChunkedDataSpace]:
+    """
+    Loads the result of a sql query or a table in the main dataframe.
+    The engines created from a database url are kept to reuse the
+    connections of their pool
+
+    :param query: sql query, or table name with a SQLAlchemy engine
+    :type query: ``str``
+    :param engine: SQLAlchemy engine, database url or DBAPI connection
+    :type engine: ``sqlalchemy.engine.Engine`` or ``str``
+    :param chunksize: number of rows per chunk: if set the rows are
+                      streamed and processed chunk by chunk, defaults to None
+    :type chunksize: ``int`` *optional*
+    :param params: parameters of the query, defaults to None
+    :type params: ``list`` or ``dict`` *optional*
+    :param kwargs: keyword arguments to pass to Pandas
+                                ``read_sql`` function
+    :return: a DataSpace, or a ChunkedDataSpace if a chunksize is set
+    :rtype: ``DataSpace`` or ``ChunkedDataSpace``
+
+    :example: `dataspace.from_sql("SELECT * FROM sales", "sqlite:///db.sqlite")`
+    """
+    if chunksize is not None:
+        return ChunkedDataSpace(
+            lambda: _load_sql_chunks(query, engine, chunksize, params, **kwargs)
+        )
+    return DataSpace(_load_sql(query, engine, params, **kwargs))
+
+
+def from_django(
+    query, columns: List[str] = None, chunksize: int = None
+) -> Union[DataSpace, ChunkedDataSpace]:
+    """
+    Load the main dataframe from a django orm query. The rows are
+    streamed from the database in batches and stored in typed columns
 
     :param query: django query from a model
     :type query: django query
+    :param columns: names of the fields to load, defaults to None (all)
+    :type columns: ``List[str]`` *optional*
+    :param chunksize: number of rows per chunk: if set the query is
+                      streamed and processed chunk by chunk, defaults to None
+    :type chunksize: ``int`` *optional*
 
-    :return: a DataSpace
-    :rtype: ``DataSpace``
+    :return: a DataSpace, or a ChunkedDataSpace if a chunksize is set
+    :rtype: ``DataSpace`` or ``ChunkedDataSpace``
 
-    :example: `dataspace.load_django(Mymodel.objects.all())`
+    :example: `dataspace.from_django(Mymodel.objects.all(), columns=["id"])`
     """
-    return DataSpace(_load_django(query))
+    if chunksize is not None:
+        return ChunkedDataSpace(lambda: _load_django_chunks(query, columns, chunksize))
+    return DataSpace(_load_django(query, columns))
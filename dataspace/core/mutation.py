@@ -0,0 +1,30 @@
+from functools import wraps
+
+from dataspace.core.trace import _span
+
+
+def _mutating(func):
+    """
+    Decorate the DataSpace methods that modify the main dataframe: in lazy
+    mode the call is recorded in the query plan, otherwise the copy policy
+    is applied before running the method, and the call is traced
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._lazy is True:
+            self._plan.append((func.__name__, args, kwargs))
+            return
+        if self._inplace is False and self._owned is False and self._df is not None:
+            # copy on write: never modify a dataframe that was passed
+            # in. The shallow copy shares the data until a column is set
+            self._df = self._df.copy(deep=False)
+        with _span(self, func.__name__):
+            try:
+                res = func(self, *args, **kwargs)
+            finally:
+                self._changed()
+        self._owned = True
+        return res
+
+    return wrapper
@@ -0,0 +1,91 @@
+from typing import Dict, List, Optional, Tuple
+
+# a plan operation: method name, positional args, keyword args
+Operation = Tuple[str, tuple, Dict]
+
+# column wise operations: method name -> (position of the first column
+# argument, True if all the remaining positional arguments are columns)
+COLUMN_OPS = {
+    "to_date": (0, True),
+    "to_int": (0, True),
+    "to_float": (0, True),
+    "to_type": (1, True),
+    "fill_nan": (1, True),
+    "fill_nulls": (1, True),
+    "fdate": (0, True),
+    "strip": (0, True),
+    "roundvals": (0, False),
+    "replace": (0, False),
+}
+
+# row filters that can be moved before the column wise operations
+FILTER_OPS = ("keep", "exclude")
+
+
+def _op_columns(op: Operation) -> Optional[List[str]]:
+    """
+    Get the columns touched by a column wise operation. Returns None
+    if the operation is not column wise or if it touches all the columns
+    """
+    name, args, _ = op
+    if name not in COLUMN_OPS:
+        return None
+    start, varargs = COLUMN_OPS[name]
+    params = args[start:] if varargs is True else args[start : start + 1]
+    cols = []
+    for param in params:
+        # some operations take a list of columns
+        if isinstance(param, list):
+            cols += param
+        else:
+            cols.append(param)
+    if len(cols) == 0:
+        return None
+    return cols
+
+
+def _push_filter(plan: List[Operation], op: Operation) -> None:
+    """
+    Add a keep or exclude filter to the plan, moving it before the
+    previous column wise operations when the result is the same
+    """
+    name, args, _ = op
+    pos = len(plan)
+    while pos > 0:
+        previous = plan[pos - 1]
+        cols = _op_columns(previous)
+        if cols is None:
+            break
+        if name == "exclude":
+            if args[0] in cols:
+                break
+        elif name == "keep":
+            kept = [col for col in cols if col in args]
+            if len(kept) == 0:
+                # the operation only touches columns removed by the filter
+                del plan[pos - 1]
+                pos -= 1
+                continue
+            if len(kept) < len(cols):
+                break
+        pos -= 1
+    plan.insert(pos, op)
+
+
+def _optimize_plan(plan: List[Operation]) -> List[Operation]:
+    """
+    Fuse and reorder the operations of a query plan: move the keep and
+    exclude filters before the column wise conversions and collapse
+    consecutive column drops
+    """
+    optimized: List[Operation] = []
+    for op in plan:
+        name, args, kwargs = op
+        previous = optimized[-1] if len(optimized) > 0 else None
+        if name == "drop" and previous is not None and previous[0] == "drop":
+            optimized[-1] = ("drop", previous[1] + args, kwargs)
+        elif name in FILTER_OPS:
+            _push_filter(optimized, op)
+        else:
+            optimized.append(op)
+    return optimized
@@ -0,0 +1,120 @@
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+# a record of a DataSpace method call
+Span = Dict[str, object]
+
+
+def _frame_stats(df: pd.DataFrame) -> Tuple[int, int]:
+    """
+    Get the number of rows and bytes of a dataframe. The bytes of
+    the objects referenced by the columns are not counted, to keep
+    this cheap
+    """
+    if df is None:
+        return 0, 0
+    return len(df.index), int(df.memory_usage(index=True, deep=False).sum())
+
+
+@contextmanager
+def _span(ds, name: str):
+    """
+    Record the wall time, rows in and out and memory delta of an
+    operation when the DataSpace is traced
+    """
+    if ds._tracing is False:
+        yield
+        return
+    rows_in, bytes_in = _frame_stats(ds._df)
+    depth = ds._trace_depth
+    ds._trace_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        ds._trace_depth -= 1
+        rows_out, bytes_out = _frame_stats(ds._df)
+        ds._trace.append(
+            {
+                "operation": name,
+                "start": start - ds._trace_start,
+                "duration": end - start,
+                "rows_in": rows_in,
+                "rows_out": rows_out,
+                "memory_delta": bytes_out - bytes_in,
+                "depth": depth,
+            }
+        )
+
+
+def _traced(func):
+    """
+    Decorate the DataSpace methods to record their calls in the trace
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with _span(self, func.__name__):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _trace_(spans: List[Span]) -> pd.DataFrame:
+    cols = [
+        "operation",
+        "start",
+        "duration",
+        "rows_in",
+        "rows_out",
+        "memory_delta",
+        "depth",
+    ]
+    df = pd.DataFrame(spans, columns=cols)
+    # the nested calls end first: order by start time
+    return df.sort_values("start", kind="stable").reset_index(drop=True)
+
+
+def _chrome_trace(spans: List[Span]) -> Dict[str, list]:
+    """
+    Convert the spans to the Chrome trace event format, readable by
+    chrome://tracing or Perfetto
+    """
+    events = []
+    for span in spans:
+        events.append(
+            {
+                "name": span["operation"],
+                "ph": "X",
+                "ts": span["start"] * 1e6,
+                "dur": span["duration"] * 1e6,
+                "pid": 1,
+                "tid": 1,
+                "args": {
+                    "rows_in": span["rows_in"],
+                    "rows_out": span["rows_out"],
+                    "memory_delta": span["memory_delta"],
+                },
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _export_trace(spans: List[Span], filepath: str, format: str = "json") -> None:
+    try:
+        if format == "json":
+            data = _trace_(spans).to_dict(orient="records")
+        elif format == "chrome":
+            data = _chrome_trace(spans)
+        else:
+            raise Exception("Trace format " + format + " unknown")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+    except Exception as e:
+        raise Exception("Can not export trace", e)
@@ -1 +1,7 @@
-from .count import _count_empty_, _count_null_, _count_unique_, _count_zero_
+from .count import (
+    _count_empty_,
+    _count_null_,
+    _count_unique_,
+    _count_zero_,
+    _profile_,
+)
@@ -1,5 +1,4 @@
 import pandas as pd
-from numpy import where
 
 from dataspace.utils.messages import msg_ok, msg_warning
 
@@ -20,22 +19,18 @@ def _count_null_(df: pd.DataFrame, col: str) -> int:
 def _count_empty_(df: pd.DataFrame, col: str) -> int:
     n: int
     try:
-        df2 = df[[col]]
-        vals = where(df2.applymap(lambda x: x == ""))
-        n = len(vals[0])
+        n = int((df[col] == "").sum())
     except Exception as e:
         msg_warning(e, "Can not count empty values")
         return
-    msg_ok("Found", n, "empty strings in column " + col)
+    msg_ok("Found", n, "empty strings in column", col)
     return n
 
 
 def _count_zero_(df: pd.DataFrame, col: str) -> int:
     n: int
     try:
-        df2 = df[[col]]
-        vals = where(df2.applymap(lambda x: x == 0))
-        n = len(vals[0])
+        n = int((df[col] == 0).sum())
     except Exception as e:
         msg_warning(e, "Can not count zero values")
         return
@@ -52,3 +47,39 @@ def _count_unique_(df: pd.DataFrame, col: str) -> int:
         return
     msg_ok("Found", n, "unique values in column", col)
     return n
+
+
+def _count_keys(counts: pd.Series, val) -> int:
+    """
+    Sum the counts of the keys equal to a value
+    """
+    try:
+        return int(counts[counts.index == val].sum())
+    except TypeError:
+        return 0
+
+
+def _profile_(df: pd.DataFrame, *cols: str) -> pd.DataFrame:
+    if len(cols) == 0:
+        cols = df.columns.values
+    rows = {}
+    try:
+        for col in cols:
+            # a single hashing pass over the column: the stats are
+            # computed from the counts of its distinct values
+            counts = df[col].value_counts(dropna=False, sort=False)
+            nulls = counts.index.isnull()
+            rows[col] = {
+                "nulls": int(counts[nulls].sum()),
+                "empty": _count_keys(counts, ""),
+                "zero": _count_keys(counts, 0),
+                "unique": int((~nulls).sum()),
+            }
+    except KeyError as e:
+        raise Exception("Can not find column", e)
+    except Exception as e:
+        raise Exception("Can not profile columns", e)
+    msg_ok("Profiled", len(rows), "columns")
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=["nulls", "empty", "zero", "unique"]
+    )
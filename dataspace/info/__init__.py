@@ -1,2 +1,2 @@
-from .info import _cols
+from .info import _cols, _memory_
 from .view import _show
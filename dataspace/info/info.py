@@ -7,10 +7,17 @@ def _cols(df: pd.DataFrame) -> pd.DataFrame:
     df = df.rename(columns={0: "value"})
 
     def run(row):
-        t = row[0]
+        t = row.iloc[0]
         return type(t).__name__
 
     s = df.apply(run, axis=1)
     df = df.rename(columns={0: "value"})
     df["types"] = s
     return df
+
+
+def _memory_(df: pd.DataFrame) -> pd.DataFrame:
+    usage = df.memory_usage(index=True, deep=True)
+    mem = pd.DataFrame({"bytes": usage})
+    mem.loc["Total"] = usage.sum()
+    return mem
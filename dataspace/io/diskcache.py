@@ -0,0 +1,149 @@
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Callable, List
+
+import pandas as pd
+
+from dataspace.utils.messages import msg_info, msg_warning
+
+# directory of the parsed files cache
+CACHE_DIR = os.environ.get(
+    "DATASPACE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "dataspace"),
+)
+
+# maximum size of the cache directory: the least recently used entries
+# are evicted above it
+CACHE_MAX_BYTES = 10 * 1024**3
+
+EXT = ".pickle"
+
+
+def _is_stable(args: str) -> bool:
+    """
+    Check if the representation of the loading arguments is the same
+    between sessions: functions and most objects show their memory address
+    """
+    return " at 0x" not in args
+
+
+def _fingerprint(files: List[str], args: str) -> str:
+    """
+    Get a cache key from the path, size and modification time of the
+    files and the loading arguments
+    """
+    h = hashlib.sha256()
+    for path in files:
+        stat = os.stat(path)
+        h.update(repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns)).encode())
+    h.update(args.encode())
+    return h.hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key + EXT)
+
+
+def _cache_get(key: str) -> pd.DataFrame:
+    path = _entry_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_pickle(path)
+    except Exception:
+        msg_warning("Removing the unreadable cache entry", path)
+        _remove(path)
+        return None
+    # mark the entry as recently used
+    os.utime(path)
+    return df
+
+
+def _cache_set(key: str, df: pd.DataFrame) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # write to a temporary file first, so that an interrupted write
+    # does not leave a broken entry
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _entry_path(key))
+    except Exception:
+        _remove(tmp)
+        raise
+    _evict(CACHE_MAX_BYTES)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _evict(max_bytes: int) -> None:
+    """
+    Remove the least recently used entries until the cache size is
+    under the maximum
+    """
+    entries = []
+    for path in glob.glob(os.path.join(CACHE_DIR, "*" + EXT)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+
+def _cached_load(
+    files: List[str], kwargs: dict, load: Callable[[], pd.DataFrame]
+) -> pd.DataFrame:
+    """
+    Get the parsed files from the cache, or load them and store them
+    in the cache
+    """
+    args = repr(sorted(kwargs.items()))
+    if not _is_stable(args):
+        msg_warning(
+            "The cache is not used: the loading arguments have functions",
+            "or objects that change between sessions",
+        )
+        return load()
+    try:
+        key = _fingerprint(files, args)
+    except OSError:
+        # let the loader report the missing file
+        return load()
+    df = _cache_get(key)
+    if df is not None:
+        if len(files) == 1:
+            msg_info("Loaded", files[0], "from the cache")
+        else:
+            msg_info("Loaded", len(files), "files from the cache")
+        return df
+    df = load()
+    if df is not None:
+        try:
+            _cache_set(key, df)
+        except Exception as e:
+            msg_warning("Can not write to the cache", CACHE_DIR, e)
+    return df
+
+
+def clear_csv_cache() -> None:
+    """
+    Remove all the entries of the parsed files cache
+
+    :example: ``dataspace.clear_csv_cache()``
+    """
+    for path in glob.glob(os.path.join(CACHE_DIR, "*" + EXT)):
+        _remove(path)
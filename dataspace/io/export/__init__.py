@@ -1,11 +1,140 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List
+
+import numpy as np
 import pandas as pd
-from dataspace.utils.messages import msg_start, msg_end
+from pandas.io.common import get_handle
+from dataspace.utils.messages import msg_start, msg_end, msg_info
+from dataspace.io.sql import _sql_engine, _copy_insert
 
 
 def _export_csv(df: pd.DataFrame, filepath: str, **kwargs) -> None:
     try:
-        msg_start("Saving data to " + filepath + " ...")
+        msg_start("Saving data to", filepath, "...")
         df.to_csv(filepath, encoding="utf-8", **kwargs)
         msg_end("Data exported to", filepath)
     except Exception as e:
         raise Exception("Can not convert data to csv", e)
+
+
+# extensions of the compressed files, kept after the part number
+COMPRESSION_EXTS = (".gz", ".bz2", ".zip", ".xz", ".zst", ".tar", ".tgz")
+
+
+def _part_path(filepath: str, part: int, parts: int) -> str:
+    """
+    Get the path of a part file: the part number is added to the file
+    name, before the file and compression extensions
+    """
+    stem, ext = os.path.splitext(filepath)
+    if ext.lower() in COMPRESSION_EXTS:
+        stem, file_ext = os.path.splitext(stem)
+        ext = file_ext + ext
+    num = str(part).zfill(len(str(parts - 1)))
+    return stem + "-" + num + ext
+
+
+def _write_csv_part(df: pd.DataFrame, filepath: str, kwargs: dict) -> str:
+    df.to_csv(filepath, encoding="utf-8", **kwargs)
+    return filepath
+
+
+def _export_csv_parts(
+    df: pd.DataFrame, filepath: str, parts: int, workers: int = None, **kwargs
+) -> List[str]:
+    try:
+        msg_start("Saving data to", parts, "parts of", filepath, "...")
+        bounds = np.linspace(0, len(df.index), parts + 1).astype(int)
+        paths = [_part_path(filepath, i, parts) for i in range(parts)]
+        slices = [df.iloc[bounds[i] : bounds[i + 1]] for i in range(parts)]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, parts)
+        if workers <= 1:
+            for part, path in zip(slices, paths):
+                _write_csv_part(part, path, kwargs)
+                msg_info("Part", path, "written")
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # send as many parts as workers at a time, to bound the
+                # memory used by the copies sent to the processes
+                for start in range(0, parts, workers):
+                    futures = [
+                        executor.submit(_write_csv_part, slices[i], paths[i], kwargs)
+                        for i in range(start, min(start + workers, parts))
+                    ]
+                    for future in futures:
+                        path = future.result()
+                        msg_info("Part", path, "written")
+        msg_end("Data exported to", parts, "parts of", filepath)
+        return paths
+    except Exception as e:
+        raise Exception("Can not convert data to csv", e)
+
+
+def _export_csv_chunks(dfs: Iterable[pd.DataFrame], filepath: str, **kwargs) -> None:
+    try:
+        msg_start("Saving data to", filepath, "...")
+        header = kwargs.pop("header", True)
+        mode = kwargs.pop("mode", "w")
+        compression = kwargs.pop("compression", "infer")
+        # one handle for all the chunks: reopening a zip or tar file in
+        # append mode adds a new member to the archive for each chunk
+        with get_handle(
+            filepath, mode, encoding="utf-8", compression=compression
+        ) as handles:
+            for df in dfs:
+                df.to_csv(handles.handle, header=header, **kwargs)
+                header = False
+        msg_end("Data exported to", filepath)
+    except Exception as e:
+        raise Exception("Can not convert data to csv", e)
+
+
+def _export_parquet(df: pd.DataFrame, filepath: str, **kwargs) -> None:
+    try:
+        msg_start("Saving data to", filepath, "...")
+        df.to_parquet(filepath, **kwargs)
+        msg_end("Data exported to", filepath)
+    except ImportError as e:
+        raise Exception("Please install pyarrow to export to parquet", e)
+    except Exception as e:
+        raise Exception("Can not convert data to parquet", e)
+
+
+def _export_feather(df: pd.DataFrame, filepath: str, **kwargs) -> None:
+    try:
+        msg_start("Saving data to", filepath, "...")
+        df.to_feather(filepath, **kwargs)
+        msg_end("Data exported to", filepath)
+    except ImportError as e:
+        raise Exception("Please install pyarrow to export to feather", e)
+    except Exception as e:
+        raise Exception("Can not convert data to feather", e)
+
+
+def _export_sql(
+    df: pd.DataFrame,
+    table: str,
+    engine,
+    if_exists: str = "append",
+    method: str = None,
+    batch_size: int = 10000,
+    **kwargs
+) -> None:
+    try:
+        if method == "copy":
+            method = _copy_insert
+        msg_start("Saving data to table", table, "...")
+        df.to_sql(
+            table,
+            _sql_engine(engine),
+            if_exists=if_exists,
+            method=method,
+            chunksize=batch_size,
+            **kwargs
+        )
+        msg_end("Data exported to table", table)
+    except Exception as e:
+        raise Exception("Can not export data to sql", e)
@@ -0,0 +1,60 @@
+import csv
+import io
+from typing import Dict
+
+# the engines created from urls, reused for their connections pool
+_ENGINES: Dict[str, object] = {}
+
+
+def _sql_engine(engine):
+    """
+    Get a SQLAlchemy engine from a database url. The engines are kept
+    so that the connections of their pool are reused between calls.
+    Engines and DBAPI connections are returned unchanged
+    """
+    if not isinstance(engine, str):
+        return engine
+    if engine not in _ENGINES:
+        try:
+            import sqlalchemy
+        except ImportError as e:
+            raise Exception("Please install sqlalchemy to use a database url", e)
+        _ENGINES[engine] = sqlalchemy.create_engine(engine, pool_pre_ping=True)
+    return _ENGINES[engine]
+
+
+def _quote(name: str) -> str:
+    """
+    Quote a PostgreSQL identifier
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _copy_insert(table, conn, keys, data_iter) -> int:
+    """
+    Insert a batch of rows with the PostgreSQL COPY command: to use as
+    the ``method`` of ``pd.to_sql``, with the psycopg2 or psycopg 3
+    driver
+    """
+    buf = io.StringIO()
+    csv.writer(buf).writerows(data_iter)
+    cols = ", ".join(_quote(k) for k in keys)
+    name = _quote(table.name)
+    if table.schema:
+        name = _quote(table.schema) + "." + name
+    sql = "COPY " + name + " (" + cols + ") FROM STDIN WITH CSV"
+    with conn.connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):
+            # psycopg2
+            buf.seek(0)
+            cursor.copy_expert(sql, buf)
+        elif hasattr(cursor, "copy"):
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buf.getvalue())
+        else:
+            raise Exception(
+                "The copy method needs a PostgreSQL database with the "
+                "psycopg2 or psycopg driver"
+            )
+        return cursor.rowcount
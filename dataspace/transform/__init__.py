@@ -1,3 +1,4 @@
 from .dataframe import _drop, _rename
 from .values import _append, _apply
-from .resample import _rsum, _rmean
+from .resample import _rsum, _rmean, IncrementalResampler
+from .groups import _split, _map_groups
@@ -0,0 +1,55 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from dataspace.utils.messages import msg_ok
+
+
+def _split(df: pd.DataFrame, col: str) -> Dict[str, pd.DataFrame]:
+    try:
+        # the rows with a missing key are kept in their own group
+        groups = df.groupby(col, sort=False, dropna=False)
+        return {key: group for key, group in groups}
+    except Exception as e:
+        raise Exception("Can not split dataframe", e)
+
+
+def _apply_groups(
+    func: Callable, groups: List[Tuple[str, pd.DataFrame]]
+) -> List[pd.DataFrame]:
+    """
+    Run a function over a batch of groups
+    """
+    return [func(group) for _, group in groups]
+
+
+def _map_groups(
+    df: pd.DataFrame, col: str, func: Callable, workers: int = None
+) -> pd.DataFrame:
+    try:
+        groups = list(df.groupby(col, sort=False, dropna=False))
+        if len(groups) == 0:
+            # nothing to map: keep the empty dataframe and its columns
+            return df
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(groups) <= 1:
+            results = _apply_groups(func, groups)
+        else:
+            # send the groups to the workers in batches to limit
+            # the inter process communication overhead
+            size = max(1, len(groups) // (workers * 4))
+            batches = [groups[i : i + size] for i in range(0, len(groups), size)]
+            results = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for batch in executor.map(
+                    _apply_groups, [func] * len(batches), batches
+                ):
+                    results.extend(batch)
+        df = pd.concat(results)
+    except Exception as e:
+        raise Exception("Can not map function over groups", e)
+    msg_ok("Mapped function over", len(groups), "groups")
+    return df
@@ -1,5 +1,17 @@
+from typing import List
+
 from dataspace.utils.messages import msg_ok
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+
+def _dateindex(df: pd.DataFrame, dateindex: str) -> pd.DataFrame:
+    try:
+        return df.set_index(pd.DatetimeIndex(df[dateindex]))
+    except Exception as e:
+        raise Exception("Can not process date index", e)
 
 
 def _resample_(
@@ -7,18 +19,15 @@ def _resample_(
 ) -> pd.DataFrame:
     try:
         if dateindex is not None:
-            try:
-                index = pd.DatetimeIndex(df[dateindex])
-                df.set_index(index, inplace=True)
-            except Exception as e:
-                raise Exception("Can not process date index", e)
-        df[num_col] = 1
+            df = _dateindex(df, dateindex)
+        # do not modify the caller's dataframe
+        df = df.assign(**{num_col: 1})
         df = df.resample(time_period)
         if method == "sum":
-            df = df.sum()
+            df = df.sum(numeric_only=True)
         elif method == "mean":
             num_vals = df[num_col].sum()
-            df = df.mean()
+            df = df.mean(numeric_only=True)
             df[num_col] = num_vals
         else:
             raise Exception("Resampling method " + method + " unknown")
@@ -44,3 +53,177 @@ def _rmean(
         return _resample_(df, "mean", time_period, num_col, dateindex)
     except Exception as e:
         raise Exception("Can not mean data", e)
+
+
+def _grow(arr: np.ndarray, size: int) -> np.ndarray:
+    """
+    Get an array with room for size rows: the capacity is doubled, so
+    that appending rows is amortized constant time per row
+    """
+    if size <= len(arr):
+        return arr
+    grown = np.zeros((max(size, 2 * len(arr)),) + arr.shape[1:], dtype=arr.dtype)
+    grown[: len(arr)] = arr
+    return grown
+
+
+class IncrementalResampler:
+    """
+    Resample a time serie incrementally: the sums and counts of each time
+    bucket are kept in preallocated float arrays, so that adding new rows
+    only updates the buckets they fall in and appends the new ones, in
+    time proportional to the new rows. New buckets older than the last
+    stored one are inserted, in time proportional to the stored buckets.
+    The fixed length buckets are aligned on the unix epoch
+    """
+
+    time_period: str = None
+    num_col: str = None
+    dateindex: str = None
+
+    def __init__(
+        self, time_period: str, num_col: str = "Number", dateindex: str = None
+    ) -> None:
+        self.time_period = time_period
+        self.num_col = num_col
+        self.dateindex = dateindex
+        self._cols = []
+        # the buckets start times in nanoseconds, sorted
+        self._keys = np.empty(0, dtype=np.int64)
+        self._sums = np.empty((0, 0))
+        self._counts = np.empty((0, 0))
+        self._size = 0
+        self._tz = None
+        self._index_name = None
+        # fixed length buckets start from the epoch to be the same for
+        # all the updates, the calendar ones are already aligned and
+        # do not take an origin
+        if isinstance(to_offset(time_period), Tick):
+            self._grouper = pd.Grouper(freq=time_period, origin="epoch")
+        else:
+            self._grouper = pd.Grouper(freq=time_period)
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Add new rows to the resampled data
+
+        :param df: the new rows
+        :type df: ``pd.DataFrame``
+
+        :example: ``resampler.update(new_df)``
+        """
+        try:
+            if self.dateindex is not None:
+                df = _dateindex(df, self.dateindex)
+            df = df.select_dtypes(include="number").assign(**{self.num_col: 1})
+            buckets = df.groupby(self._grouper)
+            counts = buckets.count()
+            touched = (counts[self.num_col] > 0).to_numpy()
+            if touched.any():
+                self._add_cols(counts.columns)
+                sums = buckets.sum()[touched]
+                counts = counts[touched]
+                self._tz = counts.index.tz
+                self._index_name = counts.index.name
+                self._merge(
+                    counts.index.as_unit("ns").asi8,
+                    sums.reindex(columns=self._cols, fill_value=0).to_numpy(float),
+                    counts.reindex(columns=self._cols, fill_value=0).to_numpy(float),
+                )
+        except Exception as e:
+            raise Exception("Can not update resampled data", e)
+        msg_ok("Resampled", len(df.index), "new rows by", self.time_period)
+
+    def _add_cols(self, cols: List[str]) -> None:
+        """
+        Add a zero column to the stored aggregates for the new columns
+        """
+        new = [col for col in cols if col not in self._cols]
+        if len(new) == 0:
+            return
+        self._cols += new
+        zeros = np.zeros((len(self._sums), len(new)))
+        self._sums = np.hstack([self._sums, zeros])
+        self._counts = np.hstack([self._counts, zeros])
+
+    def _merge(self, keys: np.ndarray, sums: np.ndarray, counts: np.ndarray) -> None:
+        """
+        Add the aggregates of sorted buckets to the stored ones
+        """
+        size = self._size
+        stored = self._keys[:size]
+        pos = np.searchsorted(stored, keys)
+        existing = np.zeros(len(keys), dtype=bool)
+        if size > 0:
+            existing = (pos < size) & (stored[np.minimum(pos, size - 1)] == keys)
+        self._sums[pos[existing]] += sums[existing]
+        self._counts[pos[existing]] += counts[existing]
+        new = ~existing
+        if not new.any():
+            return
+        if size == 0 or keys[new][0] > stored[-1]:
+            # the usual case: the new buckets come after the stored ones
+            end = size + int(new.sum())
+            self._keys = _grow(self._keys, end)
+            self._sums = _grow(self._sums, end)
+            self._counts = _grow(self._counts, end)
+            self._keys[size:end] = keys[new]
+            self._sums[size:end] = sums[new]
+            self._counts[size:end] = counts[new]
+        else:
+            self._keys = np.insert(stored, pos[new], keys[new])
+            self._sums = np.insert(self._sums[:size], pos[new], sums[new], axis=0)
+            self._counts = np.insert(self._counts[:size], pos[new], counts[new], axis=0)
+        self._size = len(stored) + int(new.sum())
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        index = pd.DatetimeIndex(self._keys[: self._size].view("M8[ns]"))
+        if self._tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self._tz)
+        index.name = self._index_name
+        return pd.DataFrame(values[: self._size], index=index, columns=self._cols)
+
+    def _full_range(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the empty buckets between the first and last buckets
+        """
+        index = pd.date_range(
+            df.index.min(), df.index.max(), freq=self.time_period, name=df.index.name
+        )
+        return df.reindex(index)
+
+    def sum_(self) -> pd.DataFrame:
+        """
+        Returns the sums of each time bucket, with the number of rows in
+        the ``num_col`` column
+
+        :return: a dataframe with a row per time bucket
+        :rtype: ``pd.DataFrame``
+
+        :example: ``resampler.sum_()``
+        """
+        if self._size == 0:
+            return pd.DataFrame()
+        df = self._full_range(self._frame(self._sums)).fillna(0)
+        df[self.num_col] = df[self.num_col].astype("int64")
+        return df
+
+    def mean_(self) -> pd.DataFrame:
+        """
+        Returns the means of each time bucket, with the number of rows in
+        the ``num_col`` column
+
+        :return: a dataframe with a row per time bucket
+        :rtype: ``pd.DataFrame``
+
+        :example: ``resampler.mean_()``
+        """
+        if self._size == 0:
+            return pd.DataFrame()
+        size = self._size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df = self._frame(self._sums[:size] / self._counts[:size])
+        df[self.num_col] = self._counts[:size, self._cols.index(self.num_col)]
+        df = self._full_range(df)
+        df[self.num_col] = df[self.num_col].fillna(0).astype("int64")
+        return df
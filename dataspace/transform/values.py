@@ -2,21 +2,22 @@ from typing import List
 import pandas as pd
 
 
-def _append(df: pd.DataFrame, vals: list, index=None) -> pd.DataFrame:
+def _append(df: pd.DataFrame, rows: List[list], index: list = None) -> pd.DataFrame:
     try:
-        if index is not None:
-            return df.append(
-                pd.DataFrame(columns=df.columns, data=[vals], index=[index])
-            )
-        else:
-            return df.append(
-                pd.DataFrame(
-                    data=[vals],
-                    columns=df.columns,
-                )
-            )
+        start = len(df.index)
+        if start > 0 and pd.api.types.is_integer_dtype(df.index):
+            # after some rows are dropped the length can be an existing label
+            start = df.index.max() + 1
+        keys = []
+        for i in range(len(rows)):
+            key = None if index is None else index[i]
+            keys.append(start + i if key is None else key)
+        new = pd.DataFrame(data=rows, columns=df.columns, index=keys)
+        if len(df.index) == 0:
+            return new
+        return pd.concat([df, new])
     except Exception as e:
-        raise Exception("Can not append row", e)
+        raise Exception("Can not append rows", e)
 
 
 def _apply(
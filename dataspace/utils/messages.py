@@ -1,45 +1,134 @@
 import datetime
+import logging
+import sys
+from typing import Union
+
 from dateutil.relativedelta import relativedelta
 
 from .colors import colors
 
+# the messages are sent to this logger and propagated to the application
+# handlers: they are displayed on the standard output if there are none
+logger = logging.getLogger("dataspace")
+
 START_TIME = None
 
+SILENT = logging.CRITICAL + 1
+
+VERBOSITY = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "silent": SILENT,
+}
+
+LABELS = {
+    "INFO": colors.blue,
+    "START": colors.purple,
+    "END": colors.purple,
+    "WARNING": colors.yellow,
+    "OK": colors.green,
+}
 
-def _unpack_msg(*msg):
+
+class _StdoutHandler(logging.StreamHandler):
     """
-    Convert all message elements to string
+    Write the messages to the current standard output, like ``print``,
+    when the application has not configured logging. Otherwise the
+    messages are only sent to the application handlers
     """
-    l = []
-    for m in msg:
-        l.append(str(m))
-    return " ".join(l)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, stream):
+        pass
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if len(logging.getLogger().handlers) > 0:
+            return False
+        return super().filter(record)
+
+
+class _LabelFormatter(logging.Formatter):
+    """
+    Format the messages with a colored label prefix
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        label = getattr(record, "label", record.levelname)
+        if label in LABELS:
+            label = LABELS[label](label)
+        return "[" + label + "] " + record.getMessage()
+
+
+def _setup_logger() -> None:
+    handler = _StdoutHandler()
+    handler.setFormatter(_LabelFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+_setup_logger()
+
+
+def set_verbosity(level: Union[str, int]) -> None:
+    """
+    Set the level of the messages to display: debug, info, warning,
+    error or silent. In silent mode the messages are not even built
+
+    :param level: name of the level or ``logging`` level
+    :type level: ``str`` or ``int``
+
+    :example: ``dataspace.set_verbosity("warning")``
+    """
+    if isinstance(level, str):
+        if level not in VERBOSITY:
+            raise Exception("Verbosity " + level + " unknown")
+        level = VERBOSITY[level]
+    logger.setLevel(level)
+
+
+class _Joined:
+    """
+    Join the elements of a message part only if the message is displayed
+    """
+
+    def __init__(self, sep: str, items) -> None:
+        self.sep = sep
+        self.items = items
+
+    def __str__(self) -> str:
+        return self.sep.join(str(item) for item in self.items)
 
 
-def _msg(label, *msg):
+def _msg(level: int, label: str, *msg):
     """
-    Prints a message with a label
+    Log a message with a label. The message elements are only converted
+    to string if the message is displayed
     """
-    txt = _unpack_msg(*msg)
-    print("[" + label + "] " + txt)
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, " ".join(["%s"] * len(msg)), *msg, extra={"label": label})
 
 
 def msg_info(*msg):
     """
-    Prints a message with an info prefix
+    Log a message with an info prefix
     """
-    label = colors.blue("INFO")
-    _msg(label, *msg)
+    _msg(logging.INFO, "INFO", *msg)
 
 
 def msg_start(*msg):
     """
-    Prints an start message
+    Log a start message
     """
     global START_TIME
     START_TIME = datetime.datetime.now()
-    label = colors.purple("START")
-    _msg(label, *msg)
+    _msg(logging.INFO, "START", *msg)
 
 
 def _endmsg(rd) -> str:
@@ -68,35 +157,32 @@ def _endmsg(rd) -> str:
     return msg
 
 
-def msg_end(self, *msg):
+def msg_end(*msg):
     """
-    Prints an end message with elapsed time
+    Log an end message with elapsed time
     """
     global START_TIME
     if START_TIME is None:
         raise Exception(
-            "No start time set: please use start() " "before using this function"
+            "No start time set: please use msg_start() before using this function"
         )
-    endtime = datetime.datetime.now()
-    rd = relativedelta(endtime, START_TIME)
-    endmsg = _endmsg(rd)
-    label = colors.purple("END")
-    msg += ("in " + endmsg,)
-    _msg(label, *msg)
+    if logger.isEnabledFor(logging.INFO):
+        endtime = datetime.datetime.now()
+        rd = relativedelta(endtime, START_TIME)
+        msg += ("in " + _endmsg(rd),)
+        _msg(logging.INFO, "END", *msg)
     START_TIME = None
 
 
 def msg_warning(*msg):
     """
-    Prints a warning
+    Log a warning
     """
-    label = colors.yellow("WARNING")
-    _msg(label, *msg)
+    _msg(logging.WARNING, "WARNING", *msg)
 
 
 def msg_ok(*msg):
     """
-    Prints a message with an ok prefix
+    Log a message with an ok prefix
     """
-    label = colors.green("OK")
-    _msg(label, *msg)
+    _msg(logging.INFO, "OK", *msg)
@@ -26,5 +26,10 @@ setup(
         "Programming Language :: Python :: 3.7",
     ],
     install_requires=["pandas", "altair", "holoviews"],
+    extras_require={
+        "arrow": ["pyarrow"],
+        "sql": ["sqlalchemy"],
+        "zstd": ["zstandard"],
+    },
     zip_safe=False,
 )